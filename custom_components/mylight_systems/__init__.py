@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+from functools import partial
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_URL
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
 
+from .api.cache import ResponseCache, cache_ttls_for_report_period
+from .api.circuit_breaker import CircuitBreaker
 from .api.client import DEFAULT_BASE_URL, MyLightApiClient
-from .const import LOGGER, PLATFORMS
+from .api.const import DEFAULT_REPORT_PERIOD_IN_SECONDS
+from .api.retry import RetryPolicy
+from .const import (
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_MASTER_REPORT_PERIOD,
+    DEFAULT_HISTORY_RETENTION_IN_DAYS,
+    DOMAIN,
+    LOGGER,
+    PLATFORMS,
+)
 from .coordinator import MyLightSystemsDataUpdateCoordinator
+from .history import MeasureHistory, async_remove_history, history_path
+from .session import async_acquire_session, async_get_rate_limiter, async_release_session
+from .store import async_remove_stores
 
 type MyLightConfigEntry = ConfigEntry[MyLightSystemsDataUpdateCoordinator]
 
@@ -17,20 +33,50 @@ type MyLightConfigEntry = ConfigEntry[MyLightSystemsDataUpdateCoordinator]
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: MyLightConfigEntry) -> bool:
     """Set up this integration using UI."""
-    session = async_get_clientsession(hass)
+    base_url = entry.data.get(CONF_URL) or DEFAULT_BASE_URL
+    session = async_acquire_session(hass, base_url)
+    entry.async_on_unload(partial(async_release_session, hass, base_url))
 
     client = MyLightApiClient(
-        base_url=entry.data.get(CONF_URL, DEFAULT_BASE_URL),
+        base_url=base_url,
         session=session,
+        cache=ResponseCache(
+            cache_ttls_for_report_period(entry.data.get(CONF_MASTER_REPORT_PERIOD) or DEFAULT_REPORT_PERIOD_IN_SECONDS)
+        ),
+        retry_policy=RetryPolicy(),
+        rate_limiter=async_get_rate_limiter(hass, base_url),
+        circuit_breaker=CircuitBreaker(),
+        time_zone=dt_util.get_default_time_zone(),
+    )
+    history = MeasureHistory(
+        hass,
+        history_path(hass, entry.entry_id),
+        int(entry.options.get(CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_IN_DAYS)),
     )
-    coordinator = MyLightSystemsDataUpdateCoordinator(hass=hass, client=client, config_entry=entry)
+    await history.async_setup()
+    entry.async_on_unload(history.async_close)
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = MyLightSystemsDataUpdateCoordinator(hass=hass, client=client, config_entry=entry, history=history)
+    await coordinator.async_restore_token()
+
+    if await coordinator.async_restore_snapshot():
+        # Entities start from the persisted data while the first live refresh runs.
+        entry.async_create_background_task(
+            hass, coordinator.async_staggered_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+        )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if "recorder" in hass.config.components:
+        # Imported here as the recorder is an optional dependency.
+        from .backfill import async_schedule_backfill  # noqa: PLC0415
+
+        entry.async_on_unload(async_schedule_backfill(hass, entry))
     entry.async_on_unload(
         entry.add_update_listener(lambda hass, entry: hass.config_entries.async_reload(entry.entry_id))
     )
@@ -43,6 +89,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: MyLightConfigEntry) ->
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: MyLightConfigEntry) -> None:
+    """Remove the data persisted for an entry."""
+    await async_remove_stores(hass, entry.entry_id)
+    await async_remove_history(hass, entry.entry_id)
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: MyLightConfigEntry) -> bool:
     """Migrate old entry data to the current version."""
     LOGGER.debug("Migrating from version %s", entry.version)
@@ -0,0 +1,75 @@
+"""Response cache for MyLight Systems API."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from .const import DEFAULT_CACHE_MAX_SIZE, DEFAULT_CACHE_TTLS_IN_SECONDS, REPORT_PERIOD_URLS
+
+
+def cache_ttls_for_report_period(report_period: int) -> dict[str, float]:
+    """Return the default endpoint TTLs with measures and states expiring on the given report period."""
+    ttls = dict(DEFAULT_CACHE_TTLS_IN_SECONDS)
+    for path in REPORT_PERIOD_URLS:
+        ttls[path] = report_period
+    return ttls
+
+
+class ResponseCache:
+    """Bounded LRU cache of decoded API responses with a TTL per endpoint."""
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ) -> None:
+        """Initialize."""
+        self._ttls: dict[str, float] = dict(DEFAULT_CACHE_TTLS_IN_SECONDS if ttls is None else ttls)
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, str, Any]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, expired ones included."""
+        return len(self._entries)
+
+    def is_cacheable(self, path: str) -> bool:
+        """Return True if responses of the endpoint may be cached."""
+        return self._ttls.get(path, 0) > 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (True, value) for a fresh entry, (False, None) otherwise."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[2]
+
+    def set(self, key: Hashable, path: str, value: Any) -> None:
+        """Store a value for the endpoint TTL, evicting the least recently used entries."""
+        ttl = self._ttls.get(path, 0)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, path, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *paths: str) -> None:
+        """Drop entries of the given endpoints, or every entry when no endpoint is given."""
+        if not paths:
+            self._entries.clear()
+            return
+
+        for key in [key for key, (_, path, _) in self._entries.items() if path in paths]:
+            del self._entries[key]
@@ -0,0 +1,78 @@
+"""Circuit breaker for MyLight Systems API."""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+
+from .const import DEFAULT_CIRCUIT_FAILURE_THRESHOLD, DEFAULT_CIRCUIT_RECOVERY_TIMEOUT_IN_SECONDS
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the API is down, letting a single trial request through after a recovery timeout."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_CIRCUIT_RECOVERY_TIMEOUT_IN_SECONDS,
+    ) -> None:
+        """Initialize."""
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_progress = False
+        self.rejected: int = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self.retry_in > 0:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left until a trial request is allowed."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._recovery_timeout - time.monotonic())
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless a request may be sent now, returning whether it is the trial request."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return False
+        if state is CircuitState.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(self.retry_in)
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached the API."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    def abort_trial(self) -> None:
+        """Allow a new trial request after the current one ended without an outcome."""
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Count an outage, opening the circuit once the threshold is reached or a trial failed."""
+        self._failures += 1
+        if self._trial_in_progress or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_progress = False
@@ -3,18 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import socket
-from typing import Any
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from datetime import date, datetime, tzinfo
+from typing import Any, TypeVar
 
 import aiohttp
 import async_timeout
+import orjson
 from yarl import URL
 
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitState
 from .const import (
     AUTH_URL,
     DEFAULT_BASE_URL,
-    DEFAULT_TIMEOUT_IN_SECONDS,
+    DEFAULT_HISTORY_CONCURRENCY,
     DEVICES_URL,
     ERR_INVALID_CREDENTIALS,
     ERR_NOT_AUTHORIZED,
@@ -29,27 +36,51 @@ from .const import (
     STATES_URL,
     SWITCH_URL,
 )
+from .decoder import JsonLoads, fingerprint
 from .exceptions import (
     CommunicationError,
     InvalidCredentialsError,
     MyLightSystemsError,
     UnauthorizedError,
 )
-from .models import InstallationDevices, Login, Measure, Room, RoomDevice, Schedule, UserProfile
+from .models import (
+    DeviceStates,
+    InstallationDevices,
+    Login,
+    Measure,
+    MeasureSeries,
+    MeasureSeriesWindow,
+    Room,
+    RoomDevice,
+    Schedule,
+    UserProfile,
+)
+from .periods import history_windows, period_count, period_starts
+from .ratelimit import PRIORITY_COMMAND, PRIORITY_POLLING, TokenBucketRateLimiter
+from .retry import RetryBudget, RetryPolicy, parse_retry_after
 from .schemas import (
     DevicesResponseSchema,
     LoginResponseSchema,
+    MeasureGroupSchema,
     MeasuresGroupingResponseSchema,
     MeasuresTotalResponseSchema,
+    MeasureValueSchema,
     ProfileResponseSchema,
     RoomsResponseSchema,
     ScheduleResponseSchema,
     StatesResponseSchema,
     SwitchResponseSchema,
 )
+from .singleflight import SingleFlight
+from .timeouts import DEFAULT_ENDPOINT_TIMEOUTS, DEFAULT_REQUEST_TIMEOUT, RequestTimeout
 
 _LOGGER = logging.getLogger(__name__)
 
+_ModelT = TypeVar("_ModelT")
+
+# Endpoints whose cached responses are stale once a switch command went through.
+_SWITCH_INVALIDATED_URLS: tuple[str, ...] = (STATES_URL, MEASURES_TOTAL_URL, MEASURES_GROUPING_URL)
+
 
 def _validate_response(response: dict[str, Any], *required_keys: str) -> None:
     """Raise MyLightSystemsError if any required key is absent from the API response."""
@@ -58,13 +89,130 @@ def _validate_response(response: dict[str, Any], *required_keys: str) -> None:
             raise MyLightSystemsError(f"Unexpected API response: missing field '{key}'")
 
 
+def _parse_measure_values(values: list[MeasureValueSchema]) -> list[Measure]:
+    """Build measures from the values of a measures response."""
+    return [Measure(value["type"], value["value"], value["unit"]) for value in values]
+
+
+def _parse_measure_series(groups: list[MeasureGroupSchema], start: datetime, group_type: str) -> MeasureSeries:
+    """Build a columnar time series from the groups of a grouping response, given in chronological order."""
+    series = MeasureSeries(group_type, period_starts(start, group_type, len(groups)))
+    for index, group in enumerate(groups):
+        for value in group["values"]:
+            column = series.values.get(value["type"])
+            if column is None:
+                column = series.values[value["type"]] = [None] * len(groups)
+                series.units[value["type"]] = value["unit"]
+            column[index] = value["value"]
+    return series
+
+
+def _parse_states(response: StatesResponseSchema) -> DeviceStates:
+    """Build a states snapshot indexed by device and sensor id."""
+    states = DeviceStates()
+
+    for device in response["deviceStates"]:
+        states.devices[device["deviceId"]] = device["state"]
+        for state in device.get("sensorStates", []):
+            states.sensors[state["sensorId"]] = Measure(
+                state["measure"]["type"],
+                state["measure"]["value"],
+                state["measure"]["unit"],
+            )
+
+    return states
+
+
+def _is_outage(exception: BaseException | None) -> bool:
+    """Return True if a request failure means the API is unreachable or failing server-side."""
+    if isinstance(exception, aiohttp.ClientResponseError):
+        return exception.status >= 500
+    return True
+
+
+def _request_key(method: str, path: str, params: dict | None, headers: dict | None) -> tuple:
+    """Build a hashable key identifying a request by method, path and normalized params."""
+    return (
+        method.upper(),
+        path,
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        tuple(sorted((str(k), str(v)) for k, v in (headers or {}).items())),
+    )
+
+
 class MyLightApiClient:
     """Main class to perform MyLight Systems API requests."""
 
-    def __init__(self, base_url: str, session: aiohttp.ClientSession) -> None:
-        """Initialize."""
+    def __init__(
+        self,
+        base_url: str,
+        session: aiohttp.ClientSession,
+        cache: ResponseCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        timeouts: Mapping[str, RequestTimeout] | None = None,
+        json_loads: JsonLoads | None = None,
+        time_zone: tzinfo | None = None,
+    ) -> None:
+        """Initialize, time_zone being the zone the grouping endpoint groups measures in."""
         self._session: aiohttp.ClientSession = session
         self._base_url = base_url if base_url and not base_url.isspace() else DEFAULT_BASE_URL
+        self._in_flight = SingleFlight()
+        self._cache = cache
+        self._retry_policy = retry_policy
+        self._retry_budget = RetryBudget(retry_policy.retry_budget) if retry_policy is not None else None
+        self._retries = 0
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._timeouts: Mapping[str, RequestTimeout] = DEFAULT_ENDPOINT_TIMEOUTS if timeouts is None else timeouts
+        self._json_loads: JsonLoads = json_loads or orjson.loads
+        self._time_zone = time_zone
+        # Last body digest and decoded body per endpoint, and the model built from that body.
+        self._fingerprints: dict[str, tuple[bytes, Any]] = {}
+        self._models: dict[str, tuple[Any, Any]] = {}
+        self._decodes_skipped = 0
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL of the API."""
+        return self._base_url
+
+    @property
+    def deduplicated_requests(self) -> int:
+        """Return the number of requests served by joining an identical in-flight request."""
+        return self._in_flight.deduplicated
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return client metrics for diagnostics."""
+        return {
+            "deduplicated_requests": self.deduplicated_requests,
+            "cache_hits": self._cache.hits if self._cache is not None else 0,
+            "cache_misses": self._cache.misses if self._cache is not None else 0,
+            "retries": self._retries,
+            "rate_limiter": self._rate_limiter.metrics if self._rate_limiter is not None else None,
+            "circuit_state": self.circuit_state,
+            "circuit_rejected_requests": self._circuit_breaker.rejected if self._circuit_breaker is not None else 0,
+            "decodes_skipped": self._decodes_skipped,
+        }
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        """Return the circuit breaker state, always closed when no breaker is configured."""
+        if self._circuit_breaker is None:
+            return CircuitState.CLOSED
+        return self._circuit_breaker.state
+
+    def invalidate_cache(self, *paths: str) -> None:
+        """Drop cached responses of the given endpoints, or all of them when none is given."""
+        if self._cache is not None:
+            self._cache.invalidate(*paths)
+
+    def reset_retry_budget(self) -> None:
+        """Restore the retry budget, called at the start of each update cycle."""
+        if self._retry_budget is not None:
+            self._retry_budget.reset()
 
     async def _execute_request(
         self,
@@ -72,43 +220,192 @@ class MyLightApiClient:
         path: str,
         params: dict | None = None,
         headers: dict | None = None,
+        idempotent: bool = True,
+        use_cache: bool = True,
     ) -> Any:
-        """Execute request."""
+        """Execute request, using the response cache and in-flight requests when possible.
+
+        Non-idempotent requests (switch commands) are never cached, coalesced or retried.
+        """
+        if not idempotent:
+            return await self._send_request(method, path, params, headers, idempotent)
+
+        key = _request_key(method, path, params, headers)
+        cache = self._cache if use_cache and self._cache is not None and self._cache.is_cacheable(path) else None
+        if cache is not None:
+            found, data = cache.get(key)
+            if found:
+                return data
+
+        data = await self._in_flight.run(key, lambda: self._send_request(method, path, params, headers, idempotent))
+        if cache is not None and isinstance(data, dict) and data.get("status") != "error":
+            cache.set(key, path, data)
+        return data
+
+    async def _send_request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None,
+        headers: dict | None,
+        idempotent: bool,
+    ) -> Any:
+        """Send request to the API through the circuit breaker and return the decoded JSON body."""
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return await self._send_with_retries(method, path, params, headers, idempotent)
+
+        trial = breaker.before_call()
         try:
-            async with async_timeout.timeout(DEFAULT_TIMEOUT_IN_SECONDS):
-                response = await self._session.request(
-                    method=method,
-                    url=URL(self._base_url).with_path(path),
-                    headers=headers,
-                    params=params,
-                )
+            data = await self._send_with_retries(method, path, params, headers, idempotent)
+        except CommunicationError as exception:
+            if _is_outage(exception.__cause__):
+                self._record_outage(breaker)
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            # Unexpected errors count as an outage rather than leaving the circuit without an outcome.
+            self._record_outage(breaker)
+            raise
+        else:
+            breaker.record_success()
+            return data
+        finally:
+            # A trial ended without an outcome, when cancelled, frees its slot for the next request.
+            if trial:
+                breaker.abort_trial()
+
+    @staticmethod
+    def _record_outage(breaker: CircuitBreaker) -> None:
+        """Count a failed request, warning when it opens the circuit."""
+        breaker.record_failure()
+        if breaker.state is not CircuitState.CLOSED:
+            _LOGGER.warning("MyLight Systems API unreachable, pausing requests for %.0fs", breaker.retry_in)
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        path: str,
+        params: dict | None,
+        headers: dict | None,
+        idempotent: bool,
+    ) -> Any:
+        """Send request to the API, retrying transient failures, and return the decoded JSON body."""
+        timeout = self._timeouts.get(path, DEFAULT_REQUEST_TIMEOUT)
+        attempt = 1
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(PRIORITY_POLLING if idempotent else PRIORITY_COMMAND)
+            try:
+                # The response context releases the connection back to the pool on every exit path,
+                # including error statuses, undecodable bodies and timeouts.
+                async with (
+                    async_timeout.timeout(timeout.total),
+                    self._session.request(
+                        method=method,
+                        url=URL(self._base_url).with_path(path),
+                        headers=headers,
+                        params=params,
+                        timeout=timeout.to_client_timeout(),
+                    ) as response,
+                ):
+                    _LOGGER.debug(
+                        "Data retrieved from %s, status: %s",
+                        response.url,
+                        response.status,
+                    )
+                    response.raise_for_status()
+                    body = await response.read()
+                break
+            except (
+                asyncio.TimeoutError,
+                aiohttp.ClientError,
+                socket.gaierror,
+            ) as exception:
+                delay = self._retry_delay(method, idempotent, attempt, exception)
+                if delay is None:
+                    _LOGGER.debug("An error occured : %s", exception, exc_info=True)
+                    raise CommunicationError() from exception
 
                 _LOGGER.debug(
-                    "Data retrieved from %s, status: %s",
-                    response.url,
-                    response.status,
+                    "Attempt %s of %s %s failed (%s), retrying in %.2fs",
+                    attempt,
+                    method.upper(),
+                    path,
+                    type(exception).__name__,
+                    delay,
                 )
-                response.raise_for_status()
-                data = await response.json()
+                self._retries += 1
+                await asyncio.sleep(delay)
+                attempt += 1
 
-                return data
-        except (
-            asyncio.TimeoutError,
-            aiohttp.ClientError,
-            socket.gaierror,
-        ) as exception:
-            _LOGGER.debug("An error occured : %s", exception, exc_info=True)
+        try:
+            return self._decode(path, body)
+        except ValueError as exception:
+            # A malformed body is returned again on retry, so it fails at once.
+            _LOGGER.debug("Undecodable response from %s: %s", path, exception, exc_info=True)
             raise CommunicationError() from exception
 
+    def _decode(self, path: str, body: bytes) -> Any:
+        """Decode a response body, returning the previous result of the endpoint when the body is unchanged."""
+        digest = fingerprint(body)
+        previous = self._fingerprints.get(path)
+        if previous is not None and previous[0] == digest:
+            self._decodes_skipped += 1
+            return previous[1]
+
+        data = self._json_loads(body)
+        self._fingerprints[path] = (digest, data)
+        return data
+
+    def _reuse_model(self, path: str, response: Any, build: Callable[[Any], _ModelT]) -> _ModelT:
+        """Build the model of a response, reusing the previous one when the endpoint returned the same response."""
+        previous = self._models.get(path)
+        if previous is not None and previous[0] is response:
+            return previous[1]
+
+        model = build(response)
+        self._models[path] = (response, model)
+        return model
+
+    def _retry_delay(self, method: str, idempotent: bool, attempt: int, exception: Exception) -> float | None:
+        """Return the delay before retrying a failed attempt, or None when it must not be retried."""
+        policy = self._retry_policy
+        if policy is None or self._retry_budget is None:
+            return None
+        if not idempotent or method.lower() != "get" or attempt >= policy.max_attempts:
+            return None
+
+        delay = policy.backoff(attempt)
+        if isinstance(exception, aiohttp.ClientResponseError):
+            if exception.status not in policy.retry_statuses:
+                return None
+            if exception.status in (429, 503) and exception.headers is not None:
+                retry_after = parse_retry_after(exception.headers.get("Retry-After"))
+                if retry_after is not None:
+                    if retry_after > policy.max_retry_after:
+                        return None
+                    delay = retry_after
+
+        if not self._retry_budget.try_spend():
+            _LOGGER.debug("Retry budget exhausted, not retrying %s", method.upper())
+            return None
+        return delay
+
     async def async_raw_request(
         self,
         method: str,
         path: str,
         params: dict | None = None,
         headers: dict | None = None,
+        use_cache: bool = True,
     ) -> Any:
-        """Execute a raw API request and return the unprocessed JSON response."""
-        return await self._execute_request(method, path, params, headers)
+        """Execute a raw API request and return the unprocessed JSON response.
+
+        Set use_cache to False to always hit the API, bypassing the response cache.
+        """
+        return await self._execute_request(method, path, params, headers, use_cache=use_cache)
 
     async def async_login(self, email: str, password: str) -> Login:
         """Log user and return the authentication token."""
@@ -182,7 +479,9 @@ class MyLightApiClient:
 
         return model
 
-    async def async_get_measures_total(self, auth_token: str, phase: str, device_id: str) -> list[Measure]:
+    async def async_get_measures_total(
+        self, auth_token: str, phase: str, device_id: str, use_cache: bool = True
+    ) -> list[Measure]:
         """Get device measures total."""
         response: MeasuresTotalResponseSchema = await self._execute_request(
             "get",
@@ -192,6 +491,7 @@ class MyLightApiClient:
                 "measureType": phase,
                 "deviceId": device_id,
             },
+            use_cache=use_cache,
         )
 
         if response["status"] == "error":
@@ -199,24 +499,21 @@ class MyLightApiClient:
                 raise UnauthorizedError()
 
         _validate_response(response, "measure")
-        measures: list[Measure] = []
-        values = response["measure"]["values"]
-
-        for value in values:
-            measures.append(Measure(value["type"], value["value"], value["unit"]))
-
-        return measures
+        return self._reuse_model(
+            MEASURES_TOTAL_URL, response, lambda data: _parse_measure_values(data["measure"]["values"])
+        )
 
-    async def async_get_measures_grouping(
+    async def _async_request_measures_grouping(
         self,
         auth_token: str,
         phase: str,
         device_id: str,
         from_date: str,
         to_date: str,
-        group_type: str = "day",
-    ) -> list[Measure]:
-        """Get device measures using the grouping endpoint."""
+        group_type: str,
+        use_cache: bool = True,
+    ) -> MeasuresGroupingResponseSchema:
+        """Request the grouping endpoint and validate its response."""
         response: MeasuresGroupingResponseSchema = await self._execute_request(
             "get",
             MEASURES_GROUPING_URL,
@@ -228,6 +525,7 @@ class MyLightApiClient:
                 "measureType": phase,
                 "deviceId": device_id,
             },
+            use_cache=use_cache,
         )
 
         if response["status"] == "error":
@@ -235,19 +533,103 @@ class MyLightApiClient:
                 raise UnauthorizedError()
 
         _validate_response(response, "measures")
-        measures: list[Measure] = []
-        measure_groups = response["measures"]
+        return response
 
-        if measure_groups:
-            for value in measure_groups[0]["values"]:
-                measures.append(Measure(value["type"], value["value"], value["unit"]))
+    async def async_get_measures_grouping(
+        self,
+        auth_token: str,
+        phase: str,
+        device_id: str,
+        from_date: str,
+        to_date: str,
+        group_type: str = "day",
+        use_cache: bool = True,
+    ) -> list[Measure]:
+        """Get device measures of the first group using the grouping endpoint."""
+        response = await self._async_request_measures_grouping(
+            auth_token, phase, device_id, from_date, to_date, group_type, use_cache
+        )
+        return self._reuse_model(
+            MEASURES_GROUPING_URL,
+            response,
+            lambda data: _parse_measure_values(data["measures"][0]["values"]) if data["measures"] else [],
+        )
 
-        return measures
+    async def async_get_measures_series(
+        self,
+        auth_token: str,
+        phase: str,
+        device_id: str,
+        from_date: str,
+        to_date: str,
+        group_type: str = "day",
+        use_cache: bool = True,
+    ) -> MeasureSeries:
+        """Get device measures of every group between from_date and to_date as a time series.
+
+        Groups carry no date and are dated by position, so a range missing some of them yields an empty series.
+        """
+        response = await self._async_request_measures_grouping(
+            auth_token, phase, device_id, from_date, to_date, group_type, use_cache
+        )
+        groups = response["measures"]
+        start = datetime.fromisoformat(from_date).replace(tzinfo=self._time_zone)
+        expected = period_count(start, datetime.fromisoformat(to_date).replace(tzinfo=self._time_zone), group_type)
+        if groups and len(groups) != expected:
+            _LOGGER.warning(
+                "Ignoring the %s measures from %s to %s: expected %d groups, received %d",
+                group_type,
+                from_date,
+                to_date,
+                expected,
+                len(groups),
+            )
+            return MeasureSeries(group_type)
+        return _parse_measure_series(groups, start, group_type)
+
+    async def async_iter_measures_series(
+        self,
+        auth_token: str,
+        phase: str,
+        device_id: str,
+        from_date: str,
+        to_date: str,
+        group_type: str = "day",
+        concurrency: int = DEFAULT_HISTORY_CONCURRENCY,
+    ) -> AsyncIterator[MeasureSeriesWindow]:
+        """Yield the series of [from_date, to_date) window by window, in order.
+
+        Up to concurrency windows are fetched ahead of the consumer, so the whole range is never held in memory.
+        To resume an interrupted range, call again with from_date set to the cursor of the last processed window.
+        """
+        windows = history_windows(date.fromisoformat(from_date), date.fromisoformat(to_date), group_type)
+        pending: deque[tuple[date, date, asyncio.Task[MeasureSeries]]] = deque()
+
+        def _fetch_ahead() -> None:
+            for start, end in itertools.islice(windows, max(1, concurrency) - len(pending)):
+                # History bypasses the response cache so that it does not evict the live polling responses.
+                fetch = self.async_get_measures_series(
+                    auth_token, phase, device_id, start.isoformat(), end.isoformat(), group_type, use_cache=False
+                )
+                pending.append((start, end, asyncio.ensure_future(fetch)))
 
-    async def async_get_battery_state(self, auth_token: str, battery_id: str) -> Measure | None:
-        """Get battery state."""
+        try:
+            _fetch_ahead()
+            while pending:
+                start, end, task = pending.popleft()
+                series = await task
+                _fetch_ahead()
+                yield MeasureSeriesWindow(start, end, series)
+        finally:
+            tasks = [task for *_, task in pending]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def async_get_states(self, auth_token: str, use_cache: bool = True) -> DeviceStates:
+        """Get a snapshot of all device and sensor states in a single request."""
         response: StatesResponseSchema = await self._execute_request(
-            "get", STATES_URL, params={"authToken": auth_token}
+            "get", STATES_URL, params={"authToken": auth_token}, use_cache=use_cache
         )
 
         if response["status"] == "error":
@@ -255,20 +637,12 @@ class MyLightApiClient:
                 raise UnauthorizedError()
 
         _validate_response(response, "deviceStates")
-        measure: Measure | None = None
+        return self._reuse_model(STATES_URL, response, _parse_states)
 
-        for device in response["deviceStates"]:
-            if device["deviceId"] == battery_id:
-                for state in device["sensorStates"]:
-                    if state["sensorId"] == battery_id + "-soc":
-                        measure = Measure(
-                            state["measure"]["type"],
-                            state["measure"]["value"],
-                            state["measure"]["unit"],
-                        )
-                        return measure
-
-        return measure
+    async def async_get_battery_state(self, auth_token: str, battery_id: str) -> Measure | None:
+        """Get battery state."""
+        states = await self.async_get_states(auth_token)
+        return states.get_battery_soc(battery_id)
 
     async def async_turn_off(self, auth_token: str, relay_id: str) -> str:
         """Turn off the switch."""
@@ -280,7 +654,9 @@ class MyLightApiClient:
                 "id": relay_id,
                 "on": "false",
             },
+            idempotent=False,
         )
+        self.invalidate_cache(*_SWITCH_INVALIDATED_URLS)
 
         if response["status"] == "error":
             if response.get("error") == ERR_SWITCH_NOT_ALLOWED:
@@ -301,7 +677,9 @@ class MyLightApiClient:
                 "id": relay_id,
                 "on": "true",
             },
+            idempotent=False,
         )
+        self.invalidate_cache(*_SWITCH_INVALIDATED_URLS)
 
         if response["status"] == "error":
             if response.get("error") == ERR_SWITCH_NOT_ALLOWED:
@@ -314,20 +692,8 @@ class MyLightApiClient:
 
     async def async_get_relay_state(self, auth_token: str, relay_id: str) -> str | None:
         """Get relay state."""
-        response: StatesResponseSchema = await self._execute_request(
-            "get", STATES_URL, params={"authToken": auth_token}
-        )
-
-        if response["status"] == "error":
-            if response.get("error") == ERR_NOT_AUTHORIZED:
-                raise UnauthorizedError()
-
-        _validate_response(response, "deviceStates")
-        for device in response["deviceStates"]:
-            if device["deviceId"] == relay_id:
-                return device["state"]
-
-        return None
+        states = await self.async_get_states(auth_token)
+        return states.get_device_state(relay_id)
 
     async def async_get_rooms(self, auth_token: str) -> list[Room]:
         """Get rooms with their devices."""
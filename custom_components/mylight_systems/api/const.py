@@ -1,6 +1,22 @@
 """Constants for MyLight Systems library."""
 
 DEFAULT_TIMEOUT_IN_SECONDS: int = 10
+DEFAULT_CONNECT_TIMEOUT_IN_SECONDS: float = 5.0
+DEFAULT_FIRST_BYTE_TIMEOUT_IN_SECONDS: float = 8.0
+
+DEFAULT_RETRY_MAX_ATTEMPTS: int = 3
+DEFAULT_RETRY_BASE_DELAY_IN_SECONDS: float = 1.0
+DEFAULT_RETRY_MAX_DELAY_IN_SECONDS: float = 10.0
+# A Retry-After longer than this is not waited for; the request fails instead.
+DEFAULT_RETRY_MAX_RETRY_AFTER_IN_SECONDS: float = 30.0
+DEFAULT_RETRY_BUDGET_PER_CYCLE: int = 4
+
+# Shared by every client talking to the same host.
+DEFAULT_RATE_LIMIT_PER_SECOND: float = 2.0
+DEFAULT_RATE_LIMIT_BURST: int = 5
+
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD: int = 5
+DEFAULT_CIRCUIT_RECOVERY_TIMEOUT_IN_SECONDS: float = 120.0
 
 ERR_INVALID_CREDENTIALS: str = "invalid.credentials"
 ERR_UNDEFINED_EMAIL: str = "undefined.email"
@@ -18,3 +34,29 @@ STATES_URL: str = "/api/states"
 SWITCH_URL: str = "/api/device/switch"
 ROOMS_URL: str = "/api/rooms"
 SCHEDULE_URL: str = "/api/schedule"
+
+# Grouping periods of the measures grouping endpoint
+GROUP_TYPE_HOUR: str = "hour"
+GROUP_TYPE_DAY: str = "day"
+GROUP_TYPE_MONTH: str = "month"
+GROUP_TYPE_YEAR: str = "year"
+
+# Range of history fetched per grouping request, sized to keep responses small.
+HISTORY_WINDOW_DAYS: dict[str, int] = {GROUP_TYPE_HOUR: 7, GROUP_TYPE_DAY: 92}
+HISTORY_WINDOW_MONTHS: dict[str, int] = {GROUP_TYPE_MONTH: 12, GROUP_TYPE_YEAR: 120}
+DEFAULT_HISTORY_CONCURRENCY: int = 2
+
+DEFAULT_CACHE_MAX_SIZE: int = 64
+DEFAULT_REPORT_PERIOD_IN_SECONDS: int = 60
+# Endpoints absent from this mapping (login, switch commands) are never cached.
+DEFAULT_CACHE_TTLS_IN_SECONDS: dict[str, float] = {
+    PROFILE_URL: 3600,
+    DEVICES_URL: 3600,
+    ROOMS_URL: 3600,
+    SCHEDULE_URL: 3600,
+    MEASURES_TOTAL_URL: DEFAULT_REPORT_PERIOD_IN_SECONDS,
+    MEASURES_GROUPING_URL: DEFAULT_REPORT_PERIOD_IN_SECONDS,
+    STATES_URL: DEFAULT_REPORT_PERIOD_IN_SECONDS,
+}
+# Endpoints whose data changes on the master report period.
+REPORT_PERIOD_URLS: tuple[str, ...] = (MEASURES_TOTAL_URL, MEASURES_GROUPING_URL, STATES_URL)
@@ -0,0 +1,14 @@
+"""JSON decoding helpers for MyLight Systems API."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+JsonLoads = Callable[[bytes], Any]
+
+
+def fingerprint(body: bytes) -> bytes:
+    """Return a cheap, collision-resistant digest of a response body."""
+    return hashlib.blake2b(body, digest_size=16).digest()
@@ -18,9 +18,18 @@ class MyLightSystemsError(Exception):
 class CommunicationError(MyLightSystemsError):
     """Exception to indicate a communication error."""
 
-    def __init__(self) -> None:
+    def __init__(self, msg: str = "A communication error occurred") -> None:
+        """Initialize."""
+        super().__init__(msg)
+
+
+class CircuitOpenError(CommunicationError):
+    """Exception to indicate the API is considered down and the request was not sent."""
+
+    def __init__(self, retry_in: float) -> None:
         """Initialize."""
-        super().__init__("A communication error occurred")
+        super().__init__(f"API unavailable, circuit breaker open for {retry_in:.0f} more seconds")
+        self.retry_in = retry_in
 
 
 class InvalidCredentialsError(MyLightSystemsError):
@@ -1,6 +1,7 @@
 """Api Models."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date, datetime
 
 
 @dataclass
@@ -44,6 +45,62 @@ class Measure:
     unit: str
 
 
+@dataclass
+class MeasureSeries:
+    """Grouped measures in columns: one start time per group and one list of values per measure type."""
+
+    group_type: str
+    timestamps: list[datetime] = field(default_factory=list)
+    values: dict[str, list[float | None]] = field(default_factory=dict)
+    units: dict[str, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the number of groups."""
+        return len(self.timestamps)
+
+    def column(self, measure_type: str) -> list[float | None]:
+        """Return the values of a measure type, None for groups that do not report it."""
+        return self.values.get(measure_type, [None] * len(self))
+
+    def measures_at(self, index: int) -> list[Measure]:
+        """Return the measures of a single group."""
+        return [
+            Measure(measure_type, value, self.units[measure_type])
+            for measure_type, column in self.values.items()
+            if (value := column[index]) is not None
+        ]
+
+
+@dataclass
+class MeasureSeriesWindow:
+    """The series of one window of a history range."""
+
+    start: date
+    end: date
+    series: MeasureSeries
+
+    @property
+    def cursor(self) -> str:
+        """Return the date to resume the range from once this window is processed."""
+        return self.end.isoformat()
+
+
+@dataclass
+class DeviceStates:
+    """Snapshot of the states endpoint, indexed by device and sensor id."""
+
+    devices: dict[str, str] = field(default_factory=dict)
+    sensors: dict[str, Measure] = field(default_factory=dict)
+
+    def get_device_state(self, device_id: str) -> str | None:
+        """Return the state of a device, or None when it is not reported."""
+        return self.devices.get(device_id)
+
+    def get_battery_soc(self, battery_id: str) -> Measure | None:
+        """Return the state of charge measure of a battery."""
+        return self.sensors.get(battery_id + "-soc")
+
+
 @dataclass
 class RoomDevice:
     """A device within a room."""
@@ -0,0 +1,88 @@
+"""Grouping periods of the measures grouping endpoint."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+
+from .const import (
+    GROUP_TYPE_DAY,
+    GROUP_TYPE_HOUR,
+    GROUP_TYPE_MONTH,
+    GROUP_TYPE_YEAR,
+    HISTORY_WINDOW_DAYS,
+    HISTORY_WINDOW_MONTHS,
+)
+
+_FIXED_PERIODS: dict[str, timedelta] = {
+    GROUP_TYPE_HOUR: timedelta(hours=1),
+    GROUP_TYPE_DAY: timedelta(days=1),
+}
+
+
+def _calendar_period_start(start: datetime, group_type: str, index: int) -> datetime:
+    """Return the start of the index-th calendar month or year from start."""
+    midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    if group_type == GROUP_TYPE_MONTH:
+        months = start.month - 1 + index
+        return midnight.replace(year=start.year + months // 12, month=months % 12 + 1, day=1)
+    return midnight.replace(year=start.year + index, month=1, day=1)
+
+
+def period_start(start: datetime, group_type: str, index: int) -> datetime:
+    """Return the start of the index-th group of a range starting at start.
+
+    Calendar groups after the first one start on the first day of their month or year. Hours of an aware start are
+    counted in UTC so that they stay one real hour apart across daylight saving time changes.
+    """
+    if group_type == GROUP_TYPE_HOUR and start.tzinfo is not None:
+        return (start.astimezone(UTC) + _FIXED_PERIODS[group_type] * index).astimezone(start.tzinfo)
+    if group_type in _FIXED_PERIODS:
+        return start + _FIXED_PERIODS[group_type] * index
+    if group_type not in (GROUP_TYPE_MONTH, GROUP_TYPE_YEAR):
+        raise ValueError(f"Unsupported group type '{group_type}'")
+    if index == 0:
+        return start
+    return _calendar_period_start(start, group_type, index)
+
+
+def period_starts(start: datetime, group_type: str, count: int) -> list[datetime]:
+    """Return the start of the first count groups of a range starting at start."""
+    return [period_start(start, group_type, index) for index in range(count)]
+
+
+def period_count(start: datetime, end: datetime, group_type: str) -> int:
+    """Return the number of groups of group_type in [start, end)."""
+    count = 0
+    while period_start(start, group_type, count) < end:
+        count += 1
+    return count
+
+
+def _add_months(day: date, months: int) -> date:
+    """Return the first day of the month months after the month of day."""
+    total = day.month - 1 + months
+    return date(day.year + total // 12, total % 12 + 1, 1)
+
+
+def history_windows(start: date, end: date, group_type: str) -> Iterator[tuple[date, date]]:
+    """Split [start, end) into consecutive windows sized for group_type.
+
+    Windows of calendar groups end on a month or year boundary so that no group is split across two requests.
+    """
+    if group_type in HISTORY_WINDOW_DAYS:
+        size = timedelta(days=HISTORY_WINDOW_DAYS[group_type])
+        while start < end:
+            window_end = min(end, start + size)
+            yield start, window_end
+            start = window_end
+        return
+    if group_type not in HISTORY_WINDOW_MONTHS:
+        raise ValueError(f"Unsupported group type '{group_type}'")
+
+    months = HISTORY_WINDOW_MONTHS[group_type]
+    while start < end:
+        anchor = start.replace(day=1) if group_type == GROUP_TYPE_MONTH else start.replace(month=1, day=1)
+        window_end = min(end, _add_months(anchor, months))
+        yield start, window_end
+        start = window_end
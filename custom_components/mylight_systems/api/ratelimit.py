@@ -0,0 +1,96 @@
+"""Rate limiting for MyLight Systems API."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any
+
+from .const import DEFAULT_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_PER_SECOND
+
+# Lower values are served first.
+PRIORITY_COMMAND: int = 0
+PRIORITY_POLLING: int = 1
+
+
+class TokenBucketRateLimiter:
+    """Token bucket serving waiting requests by priority, then in arrival order."""
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT_PER_SECOND, burst: int = DEFAULT_RATE_LIMIT_BURST) -> None:
+        """Initialize."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._acquired = 0
+        self._queued = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return queue-wait metrics."""
+        return {
+            "acquired": self._acquired,
+            "queued": self._queued,
+            "waiting": sum(1 for *_, future in self._waiters if not future.done()),
+            "total_wait_seconds": round(self._total_wait, 3),
+            "max_wait_seconds": round(self._max_wait, 3),
+        }
+
+    async def acquire(self, priority: int = PRIORITY_POLLING) -> float:
+        """Wait for a token and return the time spent waiting, in seconds."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._acquired += 1
+            return 0.0
+
+        started = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._queued += 1
+        self._schedule_wakeup()
+        await future
+
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _schedule_wakeup(self) -> None:
+        """Schedule a release of waiters for when the next token is available."""
+        if self._wakeup is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self._rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand out available tokens to the highest priority waiters."""
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            *_, future = heapq.heappop(self._waiters)
+            if future.done():
+                # The waiter was cancelled.
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        # Drop cancelled waiters so that they do not keep the timer alive.
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self._waiters:
+            self._schedule_wakeup()
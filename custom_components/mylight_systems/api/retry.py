@@ -0,0 +1,70 @@
+"""Retry policy for MyLight Systems API."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from .const import (
+    DEFAULT_RETRY_BASE_DELAY_IN_SECONDS,
+    DEFAULT_RETRY_BUDGET_PER_CYCLE,
+    DEFAULT_RETRY_MAX_ATTEMPTS,
+    DEFAULT_RETRY_MAX_DELAY_IN_SECONDS,
+    DEFAULT_RETRY_MAX_RETRY_AFTER_IN_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry policy applied to idempotent GET requests."""
+
+    max_attempts: int = DEFAULT_RETRY_MAX_ATTEMPTS
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY_IN_SECONDS
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY_IN_SECONDS
+    max_retry_after: float = DEFAULT_RETRY_MAX_RETRY_AFTER_IN_SECONDS
+    retry_budget: int = DEFAULT_RETRY_BUDGET_PER_CYCLE
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the next attempt, using exponential backoff with full jitter."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+
+class RetryBudget:
+    """Number of retries allowed until the next reset, shared by all requests of a client."""
+
+    def __init__(self, retries: int) -> None:
+        """Initialize."""
+        self._retries = retries
+        self.remaining = retries
+
+    def reset(self) -> None:
+        """Restore the full budget, typically at the start of an update cycle."""
+        self.remaining = self._retries
+
+    def try_spend(self) -> bool:
+        """Consume one retry, returning False when the budget is exhausted."""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
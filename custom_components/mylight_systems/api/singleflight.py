@@ -0,0 +1,54 @@
+"""In-flight request coalescing for MyLight Systems API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Call:
+    """A shared in-flight call and the number of callers waiting on it."""
+
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Share a single in-flight call between concurrent callers using the same key."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._calls: dict[Hashable, _Call] = {}
+        self.deduplicated: int = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory for key, or join the call already in flight for it."""
+        call = self._calls.get(key)
+        if call is not None:
+            self.deduplicated += 1
+        else:
+            call = self._calls[key] = _Call(asyncio.ensure_future(factory()))
+            call.task.add_done_callback(lambda done: self._forget(key, done))
+
+        call.waiters += 1
+        try:
+            # Shield so that one cancelled caller does not cancel the call shared with the others.
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # Nobody is left to use the result: cancel the straggler.
+            if call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        """Drop a finished call and mark its exception as retrieved."""
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,39 @@
+"""Request timeouts for MyLight Systems API."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import aiohttp
+
+from .const import (
+    AUTH_URL,
+    DEFAULT_CONNECT_TIMEOUT_IN_SECONDS,
+    DEFAULT_FIRST_BYTE_TIMEOUT_IN_SECONDS,
+    DEFAULT_TIMEOUT_IN_SECONDS,
+    MEASURES_GROUPING_URL,
+    ROOMS_URL,
+)
+
+
+@dataclass(frozen=True)
+class RequestTimeout:
+    """Timeout budgets of a request, in seconds."""
+
+    connect: float = DEFAULT_CONNECT_TIMEOUT_IN_SECONDS
+    first_byte: float = DEFAULT_FIRST_BYTE_TIMEOUT_IN_SECONDS
+    total: float = DEFAULT_TIMEOUT_IN_SECONDS
+
+    def to_client_timeout(self) -> aiohttp.ClientTimeout:
+        """Return the aiohttp timeout enforcing the connect and first-byte budgets."""
+        return aiohttp.ClientTimeout(connect=self.connect, sock_read=self.first_byte)
+
+
+DEFAULT_REQUEST_TIMEOUT = RequestTimeout()
+
+# Endpoints absent from this mapping use DEFAULT_REQUEST_TIMEOUT.
+DEFAULT_ENDPOINT_TIMEOUTS: dict[str, RequestTimeout] = {
+    AUTH_URL: RequestTimeout(first_byte=10, total=15),
+    MEASURES_GROUPING_URL: RequestTimeout(first_byte=15, total=30),
+    ROOMS_URL: RequestTimeout(first_byte=15, total=30),
+}
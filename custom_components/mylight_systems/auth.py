@@ -0,0 +1,70 @@
+"""Auth tokens shared by every user of a MyLight Systems account."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api.client import MyLightApiClient
+from .api.singleflight import SingleFlight
+from .const import DATA_TOKEN_CACHE, TOKEN_EXPIRY_MARGIN_IN_SECONDS, TOKEN_LIFETIME_IN_SECONDS
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """An auth token and the time it expires."""
+
+    auth_token: str
+    expires_at: datetime
+
+    def is_valid(self) -> bool:
+        """Return True if the token does not expire within the safety margin."""
+        return self.expires_at - timedelta(seconds=TOKEN_EXPIRY_MARGIN_IN_SECONDS) > datetime.now(UTC)
+
+
+class TokenCache:
+    """Auth tokens keyed by base URL and email, with concurrent logins for an account collapsed into one."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._tokens: dict[tuple[str, str], CachedToken] = {}
+        self._logins = SingleFlight()
+
+    def get(self, base_url: str, email: str) -> CachedToken | None:
+        """Return the cached token of an account while it is valid."""
+        token = self._tokens.get((base_url, email))
+        if token is None or not token.is_valid():
+            return None
+        return token
+
+    def set(self, base_url: str, email: str, token: CachedToken) -> None:
+        """Cache the token of an account."""
+        self._tokens[(base_url, email)] = token
+
+    def invalidate(self, base_url: str, email: str, auth_token: str) -> None:
+        """Drop the token of an account, unless it was already replaced."""
+        token = self._tokens.get((base_url, email))
+        if token is not None and token.auth_token == auth_token:
+            del self._tokens[(base_url, email)]
+
+    async def async_login(self, client: MyLightApiClient, email: str, password: str) -> CachedToken:
+        """Log in, joining a login already in flight for the same credentials, and cache the token."""
+
+        async def _login() -> CachedToken:
+            result = await client.async_login(email, password)
+            token = CachedToken(result.auth_token, datetime.now(UTC) + timedelta(seconds=TOKEN_LIFETIME_IN_SECONDS))
+            self.set(client.base_url, email, token)
+            return token
+
+        return await self._logins.run((client.base_url, email, password), _login)
+
+
+@callback
+def async_get_token_cache(hass: HomeAssistant) -> TokenCache:
+    """Return the token cache shared by the config flow, coordinators and diagnostics."""
+    cache: TokenCache | None = hass.data.get(DATA_TOKEN_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_TOKEN_CACHE] = TokenCache()
+    return cache
@@ -0,0 +1,214 @@
+"""Long-term statistics backfill for MyLight Systems."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .api.const import GROUP_TYPE_HOUR
+from .api.exceptions import MyLightSystemsError
+from .api.models import MeasureSeries, MeasureSeriesWindow
+from .api.periods import history_windows, period_count
+from .const import (
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_DAYS,
+    BACKFILL_HOUR,
+    BACKFILL_START_DELAY_IN_SECONDS,
+    CONF_GRID_TYPE,
+    CONF_VIRTUAL_DEVICE_ID,
+    DOMAIN,
+    LOGGER,
+)
+from .history import MeasureHistory
+from .store import StoredBackfill, backfill_store
+from .util.units import ws_to_wh
+
+if TYPE_CHECKING:
+    from . import MyLightConfigEntry
+
+# (measure type, statistic key, statistic name) of the energy measures imported into the recorder.
+BACKFILL_STATISTICS: tuple[tuple[str, str, str], ...] = (
+    ("produced_energy", "total_solar_production", "Solar production"),
+    ("grid_energy", "total_grid_consumption", "Grid consumption"),
+    ("grid_sans_msb_energy", "total_grid_without_battery_consumption", "Grid consumption without battery"),
+    ("msb_charge", "total_msb_charge", "Battery charge"),
+    ("msb_discharge", "total_msb_discharge", "Battery discharge"),
+    ("green_energy", "total_green_energy", "Self-consumed solar energy"),
+    ("water_heater_energy", "water_heater_energy", "Water heater"),
+)
+
+
+def statistic_id(entry_id: str, key: str) -> str:
+    """Return the external statistic id of a measure of a config entry."""
+    return f"{DOMAIN}:{entry_id.lower()}_{key}"
+
+
+def series_to_statistics(series: MeasureSeries, sums: dict[str, float]) -> dict[str, list[StatisticData]]:
+    """Convert a series in Ws into Wh statistics rows per key, continuing the running sums in place."""
+    time_zone = dt_util.get_default_time_zone()
+    starts = [timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=time_zone) for timestamp in series.timestamps]
+    rows: dict[str, list[StatisticData]] = {}
+    for measure_type, key, _ in BACKFILL_STATISTICS:
+        total = sums.get(key, 0.0)
+        key_rows: list[StatisticData] = []
+        for start, value in zip(starts, series.column(measure_type), strict=True):
+            if value is None:
+                continue
+            total += ws_to_wh(value)
+            key_rows.append(StatisticData(start=start, state=total, sum=total))
+        if key_rows:
+            rows[key] = key_rows
+            sums[key] = total
+    return rows
+
+
+def _metadata(entry: MyLightConfigEntry, key: str, name: str) -> StatisticMetaData:
+    """Return the metadata of the external statistic of a measure."""
+    return StatisticMetaData(
+        has_mean=False,
+        mean_type=StatisticMeanType.NONE,
+        has_sum=True,
+        name=f"{entry.title} {name}",
+        source=DOMAIN,
+        statistic_id=statistic_id(entry.entry_id, key),
+        unit_class=EnergyConverter.UNIT_CLASS,
+        unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+    )
+
+
+async def _async_stored_series(
+    history: MeasureHistory, device_id: str, start: date, end: date, group_type: str
+) -> MeasureSeries | None:
+    """Return the series of [start, end) from the local history, or None if any group of it is missing."""
+    start_time, end_time = dt_util.start_of_local_day(start), dt_util.start_of_local_day(end)
+    series = await history.async_get_series(device_id, group_type, start_time, end_time)
+    return series if len(series) == period_count(start_time, end_time, group_type) else None
+
+
+async def _async_iter_windows(
+    entry: MyLightConfigEntry, start: date, end: date, group_type: str
+) -> AsyncIterator[tuple[MeasureSeriesWindow, bool]]:
+    """Yield the windows of [start, end) in order, with whether they were read from the local history.
+
+    Windows already stored locally are read from disk, the others are fetched from the API range by range.
+    """
+    coordinator = entry.runtime_data
+    device_id = entry.data[CONF_VIRTUAL_DEVICE_ID]
+
+    def _fetch(range_start: date, range_end: date) -> AsyncIterator[MeasureSeriesWindow]:
+        # The token is read per range as the coordinator may have dropped it since the backfill started.
+        auth_token = coordinator.auth_token
+        if auth_token is None:
+            raise MyLightSystemsError("Authentication token is not set")
+        return coordinator.client.async_iter_measures_series(
+            auth_token,
+            entry.data[CONF_GRID_TYPE],
+            device_id,
+            range_start.isoformat(),
+            range_end.isoformat(),
+            group_type,
+        )
+
+    missing_from: date | None = None
+    for window_start, window_end in history_windows(start, end, group_type):
+        stored = None
+        if coordinator.history is not None:
+            stored = await _async_stored_series(coordinator.history, device_id, window_start, window_end, group_type)
+        if stored is None:
+            if missing_from is None:
+                missing_from = window_start
+            continue
+        if missing_from is not None:
+            async for window in _fetch(missing_from, window_start):
+                yield window, False
+            missing_from = None
+        yield MeasureSeriesWindow(window_start, window_end, stored), True
+    if missing_from is not None:
+        async for window in _fetch(missing_from, end):
+            yield window, False
+
+
+async def async_backfill_statistics(
+    hass: HomeAssistant, entry: MyLightConfigEntry, group_type: str = GROUP_TYPE_HOUR
+) -> None:
+    """Import the energy history missing since the last run into long-term statistics.
+
+    Only complete days are imported. The checkpoint is saved after each batch, so an interrupted run resumes there.
+    """
+    coordinator = entry.runtime_data
+    store = backfill_store(hass, entry.entry_id)
+    checkpoint = await store.async_load()
+    today = dt_util.now().date()
+    start = date.fromisoformat(checkpoint["cursor"]) if checkpoint else today - timedelta(days=BACKFILL_DAYS)
+    if start >= today:
+        return
+    sums: dict[str, float] = dict(checkpoint["sums"]) if checkpoint else {}
+
+    pending: defaultdict[str, list[StatisticData]] = defaultdict(list)
+    pending_rows = 0
+    cursor: str | None = None
+
+    async def _async_flush() -> None:
+        for _, key, name in BACKFILL_STATISTICS:
+            if rows := pending.pop(key, None):
+                async_add_external_statistics(hass, _metadata(entry, key, name), rows)
+        if cursor is not None:
+            await store.async_save(StoredBackfill(cursor=cursor, sums=dict(sums)))
+
+    LOGGER.debug("Backfilling statistics from %s to %s", start, today)
+    try:
+        await coordinator.authenticate_user(entry.data[CONF_EMAIL], entry.data[CONF_PASSWORD])
+        if coordinator.auth_token is None:
+            return
+        async for window, stored in _async_iter_windows(entry, start, today, group_type):
+            if coordinator.history is not None and not stored:
+                coordinator.history.async_add_series(entry.data[CONF_VIRTUAL_DEVICE_ID], window.series)
+            for key, rows in series_to_statistics(window.series, sums).items():
+                pending[key].extend(rows)
+                pending_rows += len(rows)
+            cursor = window.cursor
+            if pending_rows >= BACKFILL_BATCH_SIZE:
+                await _async_flush()
+                pending_rows = 0
+    except MyLightSystemsError as exception:
+        LOGGER.warning("Statistics backfill stopped at %s, it resumes on next start: %s", cursor or start, exception)
+    # Windows completed before a failure are still imported.
+    await _async_flush()
+
+
+@callback
+def async_schedule_backfill(hass: HomeAssistant, entry: MyLightConfigEntry) -> CALLBACK_TYPE:
+    """Run the backfill after the first refresh, then every night once the previous day is complete, never twice at once."""
+    task: asyncio.Task[None] | None = None
+
+    @callback
+    def _async_start(_now: datetime | None = None) -> None:
+        nonlocal task
+        if task is not None and not task.done():
+            return
+        task = entry.async_create_background_task(
+            hass, async_backfill_statistics(hass, entry), f"{DOMAIN} statistics backfill {entry.entry_id}"
+        )
+
+    cancel_start = async_call_later(hass, BACKFILL_START_DELAY_IN_SECONDS, _async_start)
+    # Entries run at different minutes so that they do not all query the API at once.
+    minute = int(60 * entry.runtime_data.phase_fraction)
+    cancel_nightly = async_track_time_change(hass, _async_start, hour=BACKFILL_HOUR, minute=minute, second=0)
+
+    @callback
+    def _async_cancel() -> None:
+        cancel_start()
+        cancel_nightly()
+
+    return _async_cancel
@@ -7,7 +7,6 @@ from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResu
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_URL
 from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api.client import DEFAULT_BASE_URL, MyLightApiClient
 from .api.exceptions import (
@@ -15,21 +14,31 @@ from .api.exceptions import (
     InvalidCredentialsError,
     MyLightSystemsError,
 )
+from .auth import async_get_token_cache
 from .const import (
     CONF_GRID_TYPE,
+    CONF_HISTORY_RETENTION_DAYS,
     CONF_MASTER_ID,
     CONF_MASTER_RELAY_ID,
     CONF_MASTER_REPORT_PERIOD,
     CONF_SCAN_INTERVAL,
+    CONF_STATES_SCAN_INTERVAL,
     CONF_SUBSCRIPTION_ID,
     CONF_VIRTUAL_BATTERY_ID,
     CONF_VIRTUAL_DEVICE_ID,
+    DEFAULT_HISTORY_RETENTION_IN_DAYS,
     DEFAULT_SCAN_INTERVAL_IN_MINUTES,
+    DEFAULT_STATES_SCAN_INTERVAL_IN_MINUTES,
     DOMAIN,
     LOGGER,
+    MAX_HISTORY_RETENTION_IN_DAYS,
     MAX_SCAN_INTERVAL_IN_MINUTES,
+    MAX_STATES_SCAN_INTERVAL_IN_MINUTES,
+    MIN_HISTORY_RETENTION_IN_DAYS,
     MIN_SCAN_INTERVAL_IN_MINUTES,
+    MIN_STATES_SCAN_INTERVAL_IN_MINUTES,
 )
+from .session import async_borrow_session
 
 
 class MyLightSystemsFlowHandler(ConfigFlow, domain=DOMAIN):
@@ -51,16 +60,17 @@ class MyLightSystemsFlowHandler(ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             try:
-                api_client = MyLightApiClient(
-                    base_url=user_input[CONF_URL],
-                    session=async_create_clientsession(self.hass),
-                )
+                # Holds the pool only while the flow needs it, as a mistyped URL would otherwise keep one open.
+                async with async_borrow_session(self.hass, user_input[CONF_URL] or DEFAULT_BASE_URL) as session:
+                    api_client = MyLightApiClient(base_url=user_input[CONF_URL], session=session)
 
-                login_response = await api_client.async_login(user_input[CONF_EMAIL], user_input[CONF_PASSWORD])
+                    login_response = await async_get_token_cache(self.hass).async_login(
+                        api_client, user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
+                    )
 
-                user_profile = await api_client.async_get_profile(login_response.auth_token)
+                    user_profile = await api_client.async_get_profile(login_response.auth_token)
 
-                device_ids = await api_client.async_get_devices(login_response.auth_token)
+                    device_ids = await api_client.async_get_devices(login_response.auth_token)
 
                 data = {
                     CONF_EMAIL: user_input[CONF_EMAIL],
@@ -134,12 +144,12 @@ class MyLightSystemsFlowHandler(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                api_client = MyLightApiClient(
-                    base_url=entry.data[CONF_URL],
-                    session=async_create_clientsession(self.hass),
-                )
+                async with async_borrow_session(self.hass, entry.data[CONF_URL] or DEFAULT_BASE_URL) as session:
+                    api_client = MyLightApiClient(base_url=entry.data[CONF_URL], session=session)
 
-                await api_client.async_login(entry.data[CONF_EMAIL], user_input[CONF_PASSWORD])
+                    await async_get_token_cache(self.hass).async_login(
+                        api_client, entry.data[CONF_EMAIL], user_input[CONF_PASSWORD]
+                    )
 
                 new_data = entry.data.copy()
                 new_data[CONF_PASSWORD] = user_input[CONF_PASSWORD]
@@ -181,13 +191,13 @@ class MyLightSystemsFlowHandler(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                api_client = MyLightApiClient(
-                    base_url=entry.data[CONF_URL],
-                    session=async_create_clientsession(self.hass),
-                )
+                async with async_borrow_session(self.hass, entry.data[CONF_URL] or DEFAULT_BASE_URL) as session:
+                    api_client = MyLightApiClient(base_url=entry.data[CONF_URL], session=session)
 
-                # Validate the new password by attempting to login with existing email
-                await api_client.async_login(entry.data[CONF_EMAIL], user_input[CONF_PASSWORD])
+                    # Validate the new password by attempting to login with existing email
+                    await async_get_token_cache(self.hass).async_login(
+                        api_client, entry.data[CONF_EMAIL], user_input[CONF_PASSWORD]
+                    )
 
                 # Update only the password in the config entry
                 new_data = entry.data.copy()
@@ -227,6 +237,12 @@ class MyLightSystemsOptionsFlowHandler(OptionsFlow):
             return self.async_create_entry(data=user_input)
 
         current_interval = self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_IN_MINUTES)
+        current_states_interval = self.config_entry.options.get(
+            CONF_STATES_SCAN_INTERVAL, DEFAULT_STATES_SCAN_INTERVAL_IN_MINUTES
+        )
+        current_retention = self.config_entry.options.get(
+            CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_IN_DAYS
+        )
 
         return self.async_show_form(
             step_id="init",
@@ -241,6 +257,24 @@ class MyLightSystemsOptionsFlowHandler(OptionsFlow):
                             unit_of_measurement="min",
                         )
                     ),
+                    vol.Required(CONF_STATES_SCAN_INTERVAL, default=current_states_interval): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_STATES_SCAN_INTERVAL_IN_MINUTES,
+                            max=MAX_STATES_SCAN_INTERVAL_IN_MINUTES,
+                            step=1,
+                            mode=selector.NumberSelectorMode.SLIDER,
+                            unit_of_measurement="min",
+                        )
+                    ),
+                    vol.Required(CONF_HISTORY_RETENTION_DAYS, default=current_retention): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_HISTORY_RETENTION_IN_DAYS,
+                            max=MAX_HISTORY_RETENTION_IN_DAYS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="d",
+                        )
+                    ),
                 }
             ),
         )
@@ -11,11 +11,62 @@ NAME = "MyLight Systems"
 DOMAIN = "mylight_systems"
 PLATFORMS = [Platform.SENSOR, Platform.SWITCH]
 VERSION = "0.7.0"
+ATTR_STALE_SINCE = "stale_since"
 ATTRIBUTION = "Data provided by https://www.mylight-systems.com/"
 DEFAULT_SCAN_INTERVAL_IN_MINUTES = 15
 MIN_SCAN_INTERVAL_IN_MINUTES = 5
 MAX_SCAN_INTERVAL_IN_MINUTES = 60
 CONF_SCAN_INTERVAL = "scan_interval"
+DEFAULT_STATES_SCAN_INTERVAL_IN_MINUTES = 2
+MIN_STATES_SCAN_INTERVAL_IN_MINUTES = 1
+MAX_STATES_SCAN_INTERVAL_IN_MINUTES = 60
+CONF_STATES_SCAN_INTERVAL = "states_scan_interval"
+DEFAULT_HISTORY_RETENTION_IN_DAYS = 400
+MIN_HISTORY_RETENTION_IN_DAYS = 7
+MAX_HISTORY_RETENTION_IN_DAYS = 3650
+CONF_HISTORY_RETENTION_DAYS = "history_retention_days"
+UPDATE_CYCLE_DEADLINE_IN_SECONDS = 60
+REFRESH_GROUP_STATES = "states"
+REFRESH_GROUP_ENERGY = "energy"
+REFRESH_GROUP_TOTALS = "totals"
+REFRESH_GROUP_TOLERANCE_IN_SECONDS = 10
+REPORT_POLL_DELAY_IN_SECONDS = 10
+MIN_UPDATE_INTERVAL_IN_SECONDS = 15
+MAX_BACKOFF_INTERVAL_IN_MINUTES = 60
+FIRST_REFRESH_SPREAD_IN_SECONDS = 60
+
+# Authentication
+DATA_TOKEN_CACHE = f"{DOMAIN}_tokens"
+TOKEN_LIFETIME_IN_SECONDS = 7200
+TOKEN_EXPIRY_MARGIN_IN_SECONDS = 60
+TOKEN_REFRESH_RATIO = 0.8
+TOKEN_REFRESH_JITTER_IN_SECONDS = 120
+TOKEN_REFRESH_RETRY_IN_SECONDS = 60
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_KEY_TOKEN = f"{DOMAIN}.token"
+STORAGE_KEY_BACKFILL = f"{DOMAIN}.backfill"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.snapshot"
+SNAPSHOT_SAVE_DELAY_IN_SECONDS = 60
+
+# Local measure history
+MEASURE_HISTORY_BATCH_SIZE = 500
+MEASURE_HISTORY_FLUSH_DELAY_IN_SECONDS = 30
+GROUP_TYPE_TOTAL = "total"
+
+# Statistics backfill
+BACKFILL_DAYS = 30
+BACKFILL_BATCH_SIZE = 1000
+BACKFILL_HOUR = 1
+# Past the staggered first refresh, so that the backfill does not compete with it for the API.
+BACKFILL_START_DELAY_IN_SECONDS = FIRST_REFRESH_SPREAD_IN_SECONDS + UPDATE_CYCLE_DEADLINE_IN_SECONDS
+
+# Connection pool
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+CONNECTION_LIMIT_PER_HOST = 4
+CONNECTION_KEEPALIVE_TIMEOUT_IN_SECONDS = 60
+DNS_CACHE_TTL_IN_SECONDS = 300
 
 # Configuration
 CONF_VIRTUAL_DEVICE_ID = "virtual_device_id"
@@ -3,37 +3,77 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
 from datetime import UTC, date, datetime, timedelta
-from typing import NamedTuple
+from typing import Any, NamedTuple
 
+import async_timeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 from custom_components.mylight_systems.api.models import Measure
 
 from .api.client import MyLightApiClient
+from .api.const import DEFAULT_REPORT_PERIOD_IN_SECONDS, GROUP_TYPE_DAY
 from .api.exceptions import (
+    CircuitOpenError,
     InvalidCredentialsError,
     MyLightSystemsError,
     UnauthorizedError,
 )
+from .auth import CachedToken, async_get_token_cache
 from .const import (
     CONF_GRID_TYPE,
     CONF_MASTER_RELAY_ID,
+    CONF_MASTER_REPORT_PERIOD,
     CONF_SCAN_INTERVAL,
+    CONF_STATES_SCAN_INTERVAL,
     CONF_VIRTUAL_BATTERY_ID,
     CONF_VIRTUAL_DEVICE_ID,
     DEFAULT_SCAN_INTERVAL_IN_MINUTES,
+    DEFAULT_STATES_SCAN_INTERVAL_IN_MINUTES,
     DOMAIN,
+    FIRST_REFRESH_SPREAD_IN_SECONDS,
+    GROUP_TYPE_TOTAL,
     LOGGER,
+    MIN_UPDATE_INTERVAL_IN_SECONDS,
+    REFRESH_GROUP_ENERGY,
+    REFRESH_GROUP_STATES,
+    REFRESH_GROUP_TOTALS,
+    SNAPSHOT_SAVE_DELAY_IN_SECONDS,
+    TOKEN_LIFETIME_IN_SECONDS,
+    TOKEN_REFRESH_JITTER_IN_SECONDS,
+    TOKEN_REFRESH_RATIO,
+    TOKEN_REFRESH_RETRY_IN_SECONDS,
+    UPDATE_CYCLE_DEADLINE_IN_SECONDS,
 )
+from .history import MeasureHistory
+from .refresh import RefreshGroup, ReportPhase, error_message, phase_fraction
+from .store import StoredSnapshot, StoredToken, snapshot_store, token_store
+
+STATES_FIELDS = ("battery_state", "master_relay_state")
+ENERGY_FIELDS = (
+    "produced_energy",
+    "grid_energy",
+    "grid_energy_without_battery",
+    "msb_charge",
+    "msb_discharge",
+    "green_energy",
+    "water_heater_energy",
+)
+TOTALS_FIELDS = ("autonomy_rate", "self_conso")
 
 
 class MyLightSystemsCoordinatorData(NamedTuple):
@@ -63,80 +103,70 @@ class MyLightSystemsDataUpdateCoordinator(DataUpdateCoordinator[MyLightSystemsCo
         hass: HomeAssistant,
         client: MyLightApiClient,
         config_entry: ConfigEntry,
+        history: MeasureHistory | None = None,
     ) -> None:
         """Initialize."""
         self.client = client
-        self.__auth_token: str | None = None
-        self.__token_expiration: datetime | None = None
+        self.history = history
+        self._data: MyLightSystemsCoordinatorData | None = None
+        self._changed_fields: frozenset[str] = frozenset()
+        self._state_writes: dict[str, int] = {"skipped_last_cycle": 0, "skipped_total": 0}
+        self.__token: CachedToken | None = None
+        self._token_cache = async_get_token_cache(hass)
         self._auth_lock = asyncio.Lock()
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
+        self._token_store = token_store(hass, config_entry.entry_id)
+        self._snapshot_store = snapshot_store(hass, config_entry.entry_id)
+        self._auth_metrics: dict[str, Any] = {
+            "logins": 0,
+            "login_failures": 0,
+            "background_refreshes": 0,
+            "last_login_seconds": None,
+            "max_login_seconds": 0.0,
+        }
         scan_interval = int(config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_IN_MINUTES))
+        states_scan_interval = int(
+            config_entry.options.get(CONF_STATES_SCAN_INTERVAL, DEFAULT_STATES_SCAN_INTERVAL_IN_MINUTES)
+        )
+        report_period = timedelta(
+            seconds=config_entry.data.get(CONF_MASTER_REPORT_PERIOD) or DEFAULT_REPORT_PERIOD_IN_SECONDS
+        )
+        self.phase_fraction = phase_fraction(config_entry.entry_id)
+        # States change on the master report period, energy totals are only worth refreshing slowly.
+        # Each endpoint is its own group so that a failure only retries the endpoint that failed.
+        groups = (
+            (REFRESH_GROUP_STATES, timedelta(minutes=states_scan_interval), self._async_fetch_states, STATES_FIELDS),
+            (REFRESH_GROUP_ENERGY, timedelta(minutes=scan_interval), self._async_fetch_energy, ENERGY_FIELDS),
+            (REFRESH_GROUP_TOTALS, timedelta(minutes=scan_interval), self._async_fetch_totals, TOTALS_FIELDS),
+        )
+        # A failed group is retried on the next tick of the fastest group rather than on its own interval.
+        retry_interval = min(interval for _, interval, _, _ in groups)
+        self._refresh_groups: dict[str, RefreshGroup] = {
+            name: RefreshGroup(
+                name,
+                interval,
+                fetch,
+                ReportPhase(report_period),
+                interval * self.phase_fraction,
+                fields,
+                retry_interval,
+            )
+            for name, interval, fetch, fields in groups
+        }
+        self._field_updated_at: dict[str, datetime] = {}
+        self._stale_since: dict[str, datetime] = {}
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=scan_interval),
+            update_interval=min(group.interval for group in self._refresh_groups.values()),
             config_entry=config_entry,
         )
 
     async def _async_update_data(self) -> MyLightSystemsCoordinatorData:
         """Update data via library."""
         try:
-            email = self.config_entry.data[CONF_EMAIL]
-            password = self.config_entry.data[CONF_PASSWORD]
-            grid_type = self.config_entry.data[CONF_GRID_TYPE]
-            device_id = self.config_entry.data[CONF_VIRTUAL_DEVICE_ID]
-            virtual_battery_id = self.config_entry.data[CONF_VIRTUAL_BATTERY_ID]
-            master_relay_id = self.config_entry.data.get(CONF_MASTER_RELAY_ID, None)
-
-            await self.authenticate_user(email, password)
-            if self.__auth_token is None:
-                raise UpdateFailed("Authentication token is not set after login")
-            auth_token: str = self.__auth_token
-
-            today = date.today().isoformat()
-            tomorrow = (date.today() + timedelta(days=1)).isoformat()
-
-            coroutines = [
-                self.client.async_get_measures_grouping(
-                    auth_token, grid_type, device_id, from_date=today, to_date=tomorrow
-                ),
-                self.client.async_get_measures_total(auth_token, grid_type, device_id),
-                self.client.async_get_battery_state(auth_token, virtual_battery_id),
-            ]
-            if master_relay_id is not None:
-                coroutines.append(self.client.async_get_relay_state(auth_token, master_relay_id))
-
-            results = await asyncio.gather(*coroutines)
-            energy_result = results[0]
-            total_result = results[1]
-            battery_state = results[2]
-            master_relay_state = results[3] if master_relay_id is not None else None
-
-            data = MyLightSystemsCoordinatorData(
-                produced_energy=self.find_measure_by_type(energy_result, "produced_energy"),
-                grid_energy=self.find_measure_by_type(energy_result, "grid_energy"),
-                grid_energy_without_battery=self.find_measure_by_type(energy_result, "grid_sans_msb_energy"),
-                autonomy_rate=self.find_measure_by_type(total_result, "autonomy_rate"),
-                self_conso=self.find_measure_by_type(total_result, "self_conso"),
-                msb_charge=self.find_measure_by_type(energy_result, "msb_charge"),
-                msb_discharge=self.find_measure_by_type(energy_result, "msb_discharge"),
-                green_energy=self.find_measure_by_type(energy_result, "green_energy"),
-                battery_state=battery_state,
-                master_relay_state=master_relay_state,
-                water_heater_energy=self.find_measure_by_type(energy_result, "water_heater_energy"),
-            )
-
-            self._data = data
-
-            LOGGER.info(
-                "Coordinator data refreshed: produced=%s, grid=%s, battery=%s, relay=%s",
-                data.produced_energy.value if data.produced_energy else None,
-                data.grid_energy.value if data.grid_energy else None,
-                data.battery_state.value if data.battery_state else None,
-                data.master_relay_state,
-            )
-
-            return data
+            return await self._async_fetch_data()
         except (
             UnauthorizedError,
             InvalidCredentialsError,
@@ -152,14 +182,244 @@ class MyLightSystemsDataUpdateCoordinator(DataUpdateCoordinator[MyLightSystemsCo
                 data={"entry_id": self.config_entry.entry_id},
             )
             raise ConfigEntryAuthFailed(exception) from exception
+        except CircuitOpenError as exception:
+            # The API is known to be down: skip this cycle without waiting on timeouts.
+            raise UpdateFailed(exception.msg) from exception
         except MyLightSystemsError as exception:
             raise UpdateFailed(exception) from exception
+        finally:
+            self.update_interval = self._next_update_interval()
+
+    async def _async_fetch_data(self) -> MyLightSystemsCoordinatorData:
+        """Log in if needed and refresh the groups that are due."""
+        now = dt_util.utcnow()
+        due = [group for group in self._refresh_groups.values() if group.is_due(now)]
+        self._changed_fields = frozenset()
+        self._state_writes["skipped_last_cycle"] = 0
+        try:
+            outcomes = await self._async_login_and_fetch(due)
+        except BaseException as exception:
+            for group in due:
+                group.record_failure(now, exception)
+            raise
+
+        failures: list[tuple[RefreshGroup, BaseException]] = []
+        for group, outcome in zip(due, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                group.record_failure(now, outcome)
+                failures.append((group, outcome))
+            else:
+                group.record_success(now, outcome)
+
+        all_failing = all(group.consecutive_failures for group in self._refresh_groups.values())
+        for group, exception in failures:
+            # Keep serving the previous values of a failed group, unless credentials were rejected,
+            # the API is known to be down or no group succeeds any more.
+            if (
+                all_failing
+                or not isinstance(exception, MyLightSystemsError | UpdateFailed)
+                or isinstance(exception, InvalidCredentialsError | UnauthorizedError | CircuitOpenError)
+            ):
+                raise exception
+            LOGGER.warning(
+                "Refresh of %s data failed, keeping the previous values: %s", group.name, error_message(exception)
+            )
+
+        data = self._merge_results(now, failures)
+        if self._changed_fields:
+            self._snapshot_store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY_IN_SECONDS)
+
+        LOGGER.info(
+            "Coordinator data refreshed (%s): produced=%s, grid=%s, battery=%s, relay=%s",
+            ", ".join(group.name for group in due),
+            data.produced_energy.value if data.produced_energy else None,
+            data.grid_energy.value if data.grid_energy else None,
+            data.battery_state.value if data.battery_state else None,
+            data.master_relay_state,
+        )
+
+        return data
+
+    async def _async_login_and_fetch(self, groups: list[RefreshGroup]) -> list[Any]:
+        """Log in if needed and fetch the groups, a failed or hanging login failing each of them."""
+        if not groups:
+            return []
+        deadline = time.monotonic() + UPDATE_CYCLE_DEADLINE_IN_SECONDS
+        self.client.reset_retry_budget()
+        try:
+            async with async_timeout.timeout(UPDATE_CYCLE_DEADLINE_IN_SECONDS):
+                await self.authenticate_user(self.config_entry.data[CONF_EMAIL], self.config_entry.data[CONF_PASSWORD])
+        except TimeoutError:
+            return [UpdateFailed(f"Login did not complete within {UPDATE_CYCLE_DEADLINE_IN_SECONDS} seconds")] * len(
+                groups
+            )
+        except (MyLightSystemsError, UpdateFailed) as exception:
+            return [exception] * len(groups)
+        return await self._async_fetch_groups(groups, deadline)
+
+    async def _async_fetch_groups(self, groups: list[RefreshGroup], deadline: float) -> list[Any]:
+        """Fetch the groups concurrently, cancelling only those still pending at the deadline."""
+        tasks = [asyncio.ensure_future(group.fetch()) for group in groups]
+        try:
+            await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), 0))
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        outcomes: list[Any] = []
+        for group, task in zip(groups, tasks, strict=True):
+            if task.cancelled():
+                outcomes.append(
+                    UpdateFailed(
+                        f"Refresh of {group.name} data did not complete within "
+                        f"{UPDATE_CYCLE_DEADLINE_IN_SECONDS} seconds"
+                    )
+                )
+            else:
+                outcomes.append(task.exception() or task.result())
+        return outcomes
+
+    def _merge_results(
+        self, now: datetime, failures: list[tuple[RefreshGroup, BaseException]]
+    ) -> MyLightSystemsCoordinatorData:
+        """Merge the last results of every group over the previous data, tracking the fields carried forward."""
+        fields: dict[str, Any] = self._data._asdict() if self._data is not None else {}
+        stale_since: dict[str, datetime] = {}
+        for group in self._refresh_groups.values():
+            if group.results is not None:
+                fields.update(group.results)
+            for field in group.fields:
+                if group.consecutive_failures and field in self._field_updated_at:
+                    stale_since[field] = self._field_updated_at[field]
+                elif group.last_success == now:
+                    self._field_updated_at[field] = now
+
+        missing = [field for field in MyLightSystemsCoordinatorData._fields if field not in fields]
+        if missing:
+            if failures:
+                raise failures[0][1]
+            raise UpdateFailed(f"No data received yet for {', '.join(missing)}")
+
+        data = MyLightSystemsCoordinatorData(**fields)
+        previous = self._data
+        self._changed_fields = frozenset(
+            field
+            for field in data._fields
+            if previous is None
+            or getattr(data, field) != getattr(previous, field)
+            or stale_since.get(field) != self._stale_since.get(field)
+        )
+        self._data = data
+        self._stale_since = stale_since
+        return data
+
+    async def _async_fetch_states(self) -> dict[str, Any]:
+        """Fetch the battery and relay states."""
+        virtual_battery_id = self.config_entry.data[CONF_VIRTUAL_BATTERY_ID]
+        master_relay_id = self.config_entry.data.get(CONF_MASTER_RELAY_ID, None)
+        # Scheduled polls land just after a report, while the cached response of the previous one may still be fresh.
+        (states,) = await self._async_call_with_reauth(
+            lambda token: self.client.async_get_states(token, use_cache=False)
+        )
+        return {
+            "battery_state": states.get_battery_soc(virtual_battery_id),
+            "master_relay_state": states.get_device_state(master_relay_id) if master_relay_id is not None else None,
+        }
+
+    async def _async_fetch_energy(self) -> dict[str, Any]:
+        """Fetch today's energy measures."""
+        grid_type = self.config_entry.data[CONF_GRID_TYPE]
+        device_id = self.config_entry.data[CONF_VIRTUAL_DEVICE_ID]
+        today = date.today().isoformat()
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+        (energy_result,) = await self._async_call_with_reauth(
+            lambda token: self.client.async_get_measures_grouping(
+                token, grid_type, device_id, from_date=today, to_date=tomorrow, use_cache=False
+            ),
+        )
+        if self.history is not None:
+            self.history.async_add_measures(device_id, GROUP_TYPE_DAY, dt_util.start_of_local_day(), energy_result)
+
+        return {
+            "produced_energy": self.find_measure_by_type(energy_result, "produced_energy"),
+            "grid_energy": self.find_measure_by_type(energy_result, "grid_energy"),
+            "grid_energy_without_battery": self.find_measure_by_type(energy_result, "grid_sans_msb_energy"),
+            "msb_charge": self.find_measure_by_type(energy_result, "msb_charge"),
+            "msb_discharge": self.find_measure_by_type(energy_result, "msb_discharge"),
+            "green_energy": self.find_measure_by_type(energy_result, "green_energy"),
+            "water_heater_energy": self.find_measure_by_type(energy_result, "water_heater_energy"),
+        }
+
+    async def _async_fetch_totals(self) -> dict[str, Any]:
+        """Fetch the total rates."""
+        grid_type = self.config_entry.data[CONF_GRID_TYPE]
+        device_id = self.config_entry.data[CONF_VIRTUAL_DEVICE_ID]
+
+        (total_result,) = await self._async_call_with_reauth(
+            lambda token: self.client.async_get_measures_total(token, grid_type, device_id, use_cache=False),
+        )
+        if self.history is not None:
+            self.history.async_add_measures(
+                device_id, GROUP_TYPE_TOTAL, dt_util.now().replace(second=0, microsecond=0), total_result
+            )
+
+        return {
+            "autonomy_rate": self.find_measure_by_type(total_result, "autonomy_rate"),
+            "self_conso": self.find_measure_by_type(total_result, "self_conso"),
+        }
+
+    def _next_update_interval(self) -> timedelta:
+        """Return the delay until the next refresh group is due, failed groups backing off exponentially."""
+        now = dt_util.utcnow()
+        delays = [(due - now if (due := group.next_due()) else timedelta()) for group in self._refresh_groups.values()]
+        return max(min(delays), timedelta(seconds=MIN_UPDATE_INTERVAL_IN_SECONDS))
+
+    def data_changed(self, fields: frozenset[str] | None) -> bool:
+        """Return True if any of fields, or any field when None, changed in the last refresh."""
+        if fields is None:
+            return bool(self._changed_fields)
+        return not self._changed_fields.isdisjoint(fields)
+
+    @callback
+    def record_skipped_write(self) -> None:
+        """Count an entity state write skipped because its data did not change."""
+        self._state_writes["skipped_last_cycle"] += 1
+        self._state_writes["skipped_total"] += 1
+
+    def stale_since(self, fields: frozenset[str] | None) -> datetime | None:
+        """Return since when the oldest of fields, or of all fields when None, carries a value from a failed refresh."""
+        stale = [since for field, since in self._stale_since.items() if fields is None or field in fields]
+        return min(stale, default=None)
+
+    @property
+    def stale_field_metrics(self) -> dict[str, str]:
+        """Return the fields carried forward from a failed refresh, with the time of their last good value."""
+        return {field: since.isoformat() for field, since in sorted(self._stale_since.items())}
+
+    @property
+    def state_write_metrics(self) -> dict[str, Any]:
+        """Return the fields changed by the last refresh and the state writes skipped."""
+        return {"changed_fields": sorted(self._changed_fields), **self._state_writes}
+
+    @property
+    def update_interval_metrics(self) -> dict[str, Any]:
+        """Return the effective update interval and whether failures stretched it."""
+        return {
+            "effective_seconds": self.update_interval.total_seconds() if self.update_interval else None,
+            "backing_off": any(group.consecutive_failures for group in self._refresh_groups.values()),
+        }
+
+    @property
+    def refresh_group_metrics(self) -> dict[str, dict[str, Any]]:
+        """Return the schedule and failure state of every refresh group."""
+        return {name: group.metrics for name, group in self._refresh_groups.items()}
 
     def _token_needs_refresh(self) -> bool:
-        """Return True if the auth token is missing or expires within 60 seconds."""
-        if self.__auth_token is None or self.__token_expiration is None:
-            return True
-        return self.__token_expiration - timedelta(seconds=60) < datetime.now(UTC)
+        """Return True if the auth token is missing or about to expire."""
+        return self.__token is None or not self.__token.is_valid()
 
     async def authenticate_user(self, email, password):
         """Reauthenticate user if needed, serialising refresh with a lock."""
@@ -168,28 +428,234 @@ class MyLightSystemsDataUpdateCoordinator(DataUpdateCoordinator[MyLightSystemsCo
         async with self._auth_lock:
             if not self._token_needs_refresh():
                 return
-            result = await self.client.async_login(email, password)
-            self.__auth_token = result.auth_token
-            self.__token_expiration = datetime.now(UTC) + timedelta(hours=2)
-            ir.async_delete_issue(self.hass, DOMAIN, "auth_failed")
-            LOGGER.info("Authentication successful, token expires at %s", self.__token_expiration.isoformat())
+            cached = self._token_cache.get(self.client.base_url, email)
+            if cached is not None:
+                # Another user of the account, such as the config flow, already logged in.
+                await self._async_use_token(email, cached)
+                return
+            await self._async_login(email, password)
+
+    async def _async_login(self, email: str, password: str) -> None:
+        """Log in and use the new token, the caller holding _auth_lock."""
+        started = time.monotonic()
+        try:
+            token = await self._token_cache.async_login(self.client, email, password)
+        except MyLightSystemsError:
+            self._auth_metrics["login_failures"] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self._auth_metrics["last_login_seconds"] = round(elapsed, 3)
+            self._auth_metrics["max_login_seconds"] = round(max(self._auth_metrics["max_login_seconds"], elapsed), 3)
+        self._auth_metrics["logins"] += 1
+        LOGGER.info("Authentication successful, token expires at %s", token.expires_at.isoformat())
+        await self._async_use_token(email, token)
+
+    async def _async_use_token(self, email: str, token: CachedToken) -> None:
+        """Use a token, persist it and schedule its renewal."""
+        self.__token = token
+        ir.async_delete_issue(self.hass, DOMAIN, "auth_failed")
+        await self._token_store.async_save(
+            StoredToken(email=email, auth_token=token.auth_token, expires_at=token.expires_at.isoformat())
+        )
+        self._schedule_token_refresh(self._token_refresh_delay())
+
+    async def async_restore_token(self) -> None:
+        """Reuse the token persisted before a restart while it is still valid."""
+        email = self.config_entry.data[CONF_EMAIL]
+        stored = await self._token_store.async_load()
+        if stored is None or stored.get("email") != email:
+            return
+        try:
+            token = CachedToken(stored["auth_token"], datetime.fromisoformat(stored["expires_at"]))
+        except (KeyError, TypeError, ValueError):
+            LOGGER.debug("Ignoring malformed stored token")
+            return
+        if not token.is_valid():
+            return
+
+        async with self._auth_lock:
+            if self.__token is not None:
+                return
+            self.__token = token
+            if self._token_cache.get(self.client.base_url, email) is None:
+                self._token_cache.set(self.client.base_url, email, token)
+        # A token revoked meanwhile is replaced on its first UnauthorizedError.
+        LOGGER.debug("Reusing stored token, expires at %s", token.expires_at.isoformat())
+        self._schedule_token_refresh(self._token_refresh_delay())
+
+    def _token_refresh_delay(self) -> float:
+        """Return the delay before renewing the token, at TOKEN_REFRESH_RATIO of its lifetime with jitter."""
+        if self.__token is None:
+            return 0.0
+        remaining = (self.__token.expires_at - datetime.now(UTC)).total_seconds()
+        margin = TOKEN_LIFETIME_IN_SECONDS * (1 - TOKEN_REFRESH_RATIO)
+        return max(0.0, remaining - margin - random.uniform(0, TOKEN_REFRESH_JITTER_IN_SECONDS))  # noqa: S311
+
+    @callback
+    def _schedule_token_refresh(self, delay: float) -> None:
+        """Schedule the background renewal of the token in delay seconds."""
+        self._cancel_token_refresh()
+        self._unsub_token_refresh = async_call_later(
+            self.hass, delay, HassJob(self._handle_token_refresh, cancel_on_shutdown=True)
+        )
+
+    @callback
+    def _cancel_token_refresh(self) -> None:
+        """Cancel the scheduled token renewal, if any."""
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+
+    @callback
+    def _handle_token_refresh(self, _now: datetime) -> None:
+        """Start the token renewal in the background."""
+        self._unsub_token_refresh = None
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_refresh_token(), f"{DOMAIN} token refresh {self.config_entry.entry_id}"
+        )
+
+    async def _async_refresh_token(self) -> None:
+        """Renew the token ahead of its expiry so that updates and commands never wait on a login."""
+        email = self.config_entry.data[CONF_EMAIL]
+        async with self._auth_lock:
+            cached = self._token_cache.get(self.client.base_url, email)
+            if cached is not None and self.__token is not None and cached.expires_at > self.__token.expires_at:
+                # Another entry of the account renewed the shared token first.
+                await self._async_use_token(email, cached)
+                return
+            try:
+                await self._async_login(email, self.config_entry.data[CONF_PASSWORD])
+            except InvalidCredentialsError:
+                # Leave it to the next update cycle to log in inline and start the reauth flow.
+                LOGGER.warning("Background token refresh was rejected, credentials are no longer valid")
+                return
+            except MyLightSystemsError as exception:
+                LOGGER.warning(
+                    "Background token refresh failed, retrying in %s seconds: %s",
+                    TOKEN_REFRESH_RETRY_IN_SECONDS,
+                    exception,
+                )
+                self._schedule_token_refresh(TOKEN_REFRESH_RETRY_IN_SECONDS)
+                return
+            self._auth_metrics["background_refreshes"] += 1
+
+    async def async_shutdown(self) -> None:
+        """Cancel the scheduled token renewal along with the scheduled refresh, and save the last data."""
+        self._cancel_token_refresh()
+        await super().async_shutdown()
+        if self._data is not None:
+            await self._snapshot_store.async_save(self._snapshot())
+
+    async def async_staggered_refresh(self) -> None:
+        """Refresh after the delay of the entry, so that entries set up together do not refresh together."""
+        await asyncio.sleep(FIRST_REFRESH_SPREAD_IN_SECONDS * self.phase_fraction)
+        await self.async_refresh()
+
+    def _snapshot(self) -> StoredSnapshot:
+        """Return the last data in its persisted form."""
+        data = self._data._asdict() if self._data is not None else {}
+        return StoredSnapshot(
+            saved_at=dt_util.utcnow().isoformat(),
+            data={field: asdict(value) if isinstance(value, Measure) else value for field, value in data.items()},
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Serve the data persisted before a restart if it was saved today, returning True if it was."""
+        stored = await self._snapshot_store.async_load()
+        if stored is None:
+            return False
+        try:
+            saved_at = datetime.fromisoformat(stored["saved_at"])
+            fields: dict[str, Any] = {
+                field: Measure(**value) if isinstance(value, dict) else value for field, value in stored["data"].items()
+            }
+            data = MyLightSystemsCoordinatorData(**fields)
+        except (KeyError, TypeError, ValueError):
+            LOGGER.debug("Ignoring unreadable data snapshot")
+            return False
+        # Energy measures are daily totals: a snapshot from a previous day is meaningless.
+        if saved_at < dt_util.start_of_local_day():
+            return False
+
+        self._data = self.data = data
+        self._changed_fields = frozenset(data._fields)
+        self._field_updated_at = dict.fromkeys(data._fields, saved_at)
+        LOGGER.debug("Restored data snapshot saved at %s", saved_at)
+        return True
+
+    async def _async_relogin(self, rejected_token: str) -> None:
+        """Invalidate a token the API rejected and log in again once, however many requests failed with it."""
+        email = self.config_entry.data[CONF_EMAIL]
+        async with self._auth_lock:
+            if self.__token is None or self.__token.auth_token != rejected_token:
+                # Another request already replaced the rejected token.
+                return
+            # The rejected token stays in place until the new one is installed: requests sent meanwhile are
+            # rejected too and wait here on the lock, instead of finding no token at all.
+            self._token_cache.invalidate(self.client.base_url, email, rejected_token)
+            cached = self._token_cache.get(self.client.base_url, email)
+            if cached is not None:
+                await self._async_use_token(email, cached)
+                return
+            LOGGER.info("Authentication token was rejected before its expiry, logging in again")
+            await self._async_login(email, self.config_entry.data[CONF_PASSWORD])
+
+    async def _async_call_with_reauth(self, *calls: Callable[[str], Awaitable[Any]]) -> list[Any]:
+        """Run API calls concurrently, logging in again and replaying only the calls rejected as unauthorized.
+
+        Only a rejected login raises InvalidCredentialsError and escalates to reauth.
+        """
+        if self.__token is None:
+            raise UpdateFailed("Authentication token is not set")
+        token = self.__token.auth_token
+
+        results = list(await asyncio.gather(*(call(token) for call in calls), return_exceptions=True))
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, UnauthorizedError):
+                raise result
+
+        rejected = [index for index, result in enumerate(results) if isinstance(result, UnauthorizedError)]
+        if not rejected:
+            return results
+
+        await self._async_relogin(token)
+        if self.__token is None:
+            raise UpdateFailed("Authentication token is not set after login")
+        new_token = self.__token.auth_token
+        try:
+            replayed = await asyncio.gather(*(calls[index](new_token) for index in rejected))
+        except UnauthorizedError as exception:
+            raise UpdateFailed("Requests were rejected right after a successful login") from exception
+
+        for index, result in zip(rejected, replayed, strict=True):
+            results[index] = result
+        return results
 
     async def turn_on_master_relay(self):
         """Turn on master relay."""
-        if self.__auth_token is None:
-            raise UpdateFailed("Authentication token is not set")
-        await self.client.async_turn_on(self.__auth_token, self.config_entry.data[CONF_MASTER_RELAY_ID])
+        relay_id = self.config_entry.data[CONF_MASTER_RELAY_ID]
+        await self._async_call_with_reauth(lambda token: self.client.async_turn_on(token, relay_id))
+        self._refresh_groups[REFRESH_GROUP_STATES].invalidate()
 
     async def turn_off_master_relay(self):
         """Turn off master relay."""
-        if self.__auth_token is None:
-            raise UpdateFailed("Authentication token is not set")
-        await self.client.async_turn_off(self.__auth_token, self.config_entry.data[CONF_MASTER_RELAY_ID])
+        relay_id = self.config_entry.data[CONF_MASTER_RELAY_ID]
+        await self._async_call_with_reauth(lambda token: self.client.async_turn_off(token, relay_id))
+        self._refresh_groups[REFRESH_GROUP_STATES].invalidate()
 
     @property
     def auth_token(self) -> str | None:
         """Return the current auth token."""
-        return self.__auth_token
+        return self.__token.auth_token if self.__token is not None else None
+
+    @property
+    def auth_metrics(self) -> dict[str, Any]:
+        """Return login latency and failure metrics."""
+        return {
+            **self._auth_metrics,
+            "token_expires_at": self.__token.expires_at.isoformat() if self.__token is not None else None,
+        }
 
     def master_relay_is_on(self) -> bool:
         """Return true if master relay is on."""
@@ -188,4 +188,10 @@ async def async_get_config_entry_diagnostics(
         if coordinator.data
         else None,
         "raw_api_responses": raw_api_responses,
+        "api_metrics": coordinator.client.metrics,
+        "auth_metrics": coordinator.auth_metrics,
+        "update_interval": coordinator.update_interval_metrics,
+        "refresh_groups": coordinator.refresh_group_metrics,
+        "state_writes": coordinator.state_write_metrics,
+        "stale_fields": coordinator.stale_field_metrics,
     }
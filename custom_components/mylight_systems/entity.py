@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DOMAIN, NAME, VERSION
+from .const import ATTR_STALE_SINCE, ATTRIBUTION, DOMAIN, NAME, VERSION
 from .coordinator import MyLightSystemsDataUpdateCoordinator
 
 
@@ -15,9 +19,12 @@ class IntegrationMyLightSystemsEntity(CoordinatorEntity[MyLightSystemsDataUpdate
     _attr_attribution = ATTRIBUTION
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: MyLightSystemsDataUpdateCoordinator) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+    def __init__(
+        self, coordinator: MyLightSystemsDataUpdateCoordinator, data_fields: Iterable[str] | None = None
+    ) -> None:
+        """Initialize, listening to the given coordinator data fields or to all of them when None."""
+        super().__init__(coordinator, context=frozenset(data_fields) if data_fields is not None else None)
+        self._written_available: bool | None = None
         self._attr_unique_id = coordinator.config_entry.entry_id
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
@@ -25,3 +32,19 @@ class IntegrationMyLightSystemsEntity(CoordinatorEntity[MyLightSystemsDataUpdate
             model=VERSION,
             manufacturer=NAME,
         )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return since when the entity shows a value carried forward from a failed refresh."""
+        stale_since = self.coordinator.stale_since(self.coordinator_context)
+        return {ATTR_STALE_SINCE: stale_since.isoformat()} if stale_since is not None else None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the data fields of the entity or its availability changed."""
+        available = self.available
+        if available == self._written_available and not self.coordinator.data_changed(self.coordinator_context):
+            self.coordinator.record_skipped_write()
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
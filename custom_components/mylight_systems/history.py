@@ -0,0 +1,214 @@
+"""Local history of fetched measures, stored in SQLite."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from .api.models import Measure, MeasureSeries
+from .const import DOMAIN, LOGGER, MEASURE_HISTORY_BATCH_SIZE, MEASURE_HISTORY_FLUSH_DELAY_IN_SECONDS
+
+# The primary key doubles as the index for range scans of a measure over time.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measures (
+    device_id TEXT NOT NULL,
+    measure_type TEXT NOT NULL,
+    group_type TEXT NOT NULL,
+    period_start INTEGER NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT NOT NULL,
+    PRIMARY KEY (device_id, measure_type, group_type, period_start)
+) WITHOUT ROWID
+"""
+_UPSERT = """
+INSERT INTO measures (device_id, measure_type, group_type, period_start, value, unit)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (device_id, measure_type, group_type, period_start) DO UPDATE SET value = excluded.value, unit = excluded.unit
+"""
+_SELECT_RANGE = """
+SELECT measure_type, period_start, value, unit FROM measures
+WHERE device_id = ? AND group_type = ? AND period_start >= ? AND period_start < ?
+ORDER BY period_start
+"""
+_PURGE = "DELETE FROM measures WHERE period_start < ?"
+
+# (device_id, measure_type, group_type, period_start, value, unit)
+_Row = tuple[str, str, str, int, float, str]
+
+
+def _to_timestamp(period_start: datetime) -> int:
+    """Return the epoch of a period start given in local time."""
+    if period_start.tzinfo is None:
+        period_start = period_start.replace(tzinfo=dt_util.get_default_time_zone())
+    return int(period_start.timestamp())
+
+
+def _from_timestamp(timestamp: int) -> datetime:
+    """Return a period start in local time, like the series built by the API client."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+
+
+def history_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the history database of a config entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.db")
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the history database of a config entry."""
+    path = history_path(hass, entry_id)
+
+    def _remove() -> None:
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path + suffix)
+
+    await hass.async_add_executor_job(_remove)
+
+
+class MeasureHistory:
+    """Measures keyed by device, measure type, group type and period start, written in batches off the event loop."""
+
+    def __init__(self, hass: HomeAssistant, path: str, retention_days: int) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._path = path
+        self._retention = timedelta(days=retention_days)
+        self._connection: sqlite3.Connection | None = None
+        # Serialises the executor jobs sharing the connection.
+        self._lock = asyncio.Lock()
+        self._pending: list[_Row] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._last_purge: datetime | None = None
+
+    async def async_setup(self) -> None:
+        """Open the database and create its schema."""
+        async with self._lock:
+            self._connection = await self._hass.async_add_executor_job(self._open)
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database, in the executor."""
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_SCHEMA)
+        connection.commit()
+        return connection
+
+    async def async_close(self) -> None:
+        """Write pending measures and close the database."""
+        self._cancel_flush()
+        await self.async_flush()
+        async with self._lock:
+            if self._connection is not None:
+                await self._hass.async_add_executor_job(self._connection.close)
+                self._connection = None
+
+    @callback
+    def async_add_measures(
+        self, device_id: str, group_type: str, period_start: datetime, measures: Iterable[Measure]
+    ) -> None:
+        """Queue the measures of a single period."""
+        timestamp = _to_timestamp(period_start)
+        self._queue(
+            (device_id, measure.type, group_type, timestamp, measure.value, measure.unit) for measure in measures
+        )
+
+    @callback
+    def async_add_series(self, device_id: str, series: MeasureSeries) -> None:
+        """Queue every value of a series."""
+        timestamps = [_to_timestamp(period_start) for period_start in series.timestamps]
+        self._queue(
+            (device_id, measure_type, series.group_type, timestamp, value, series.units[measure_type])
+            for measure_type, column in series.values.items()
+            for timestamp, value in zip(timestamps, column, strict=True)
+            if value is not None
+        )
+
+    @callback
+    def _queue(self, rows: Iterable[_Row]) -> None:
+        """Queue rows, writing them once a batch is full or after a short delay."""
+        self._pending.extend(rows)
+        if len(self._pending) >= MEASURE_HISTORY_BATCH_SIZE:
+            self._cancel_flush()
+            self._hass.async_create_background_task(self.async_flush(), f"{DOMAIN} history flush")
+        elif self._unsub_flush is None and self._pending:
+            self._unsub_flush = async_call_later(
+                self._hass, MEASURE_HISTORY_FLUSH_DELAY_IN_SECONDS, HassJob(self._handle_flush, cancel_on_shutdown=True)
+            )
+
+    @callback
+    def _handle_flush(self, _now: datetime) -> None:
+        """Write the measures queued during the flush delay."""
+        self._unsub_flush = None
+        self._hass.async_create_background_task(self.async_flush(), f"{DOMAIN} history flush")
+
+    @callback
+    def _cancel_flush(self) -> None:
+        """Cancel the delayed flush, if any."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    async def async_flush(self) -> None:
+        """Write queued measures in one transaction and apply retention at most once a day."""
+        async with self._lock:
+            if self._connection is None:
+                return
+            rows, self._pending = self._pending, []
+            now = dt_util.utcnow()
+            purge_before = None
+            if self._last_purge is None or now - self._last_purge >= timedelta(days=1):
+                purge_before = int((now - self._retention).timestamp())
+                self._last_purge = now
+            if not rows and purge_before is None:
+                return
+            try:
+                await self._hass.async_add_executor_job(self._write, self._connection, rows, purge_before)
+            except sqlite3.Error:
+                LOGGER.exception("Failed to write %s measures to the local history", len(rows))
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, rows: list[_Row], purge_before: int | None) -> None:
+        """Upsert rows and purge expired ones, in the executor."""
+        with connection:
+            connection.executemany(_UPSERT, rows)
+            if purge_before is not None:
+                connection.execute(_PURGE, (purge_before,))
+
+    async def async_get_series(self, device_id: str, group_type: str, start: datetime, end: datetime) -> MeasureSeries:
+        """Return the stored measures of [start, end) as a series, flushing queued measures first."""
+        await self.async_flush()
+        async with self._lock:
+            if self._connection is None:
+                return MeasureSeries(group_type)
+            rows = await self._hass.async_add_executor_job(
+                self._read, self._connection, (device_id, group_type, _to_timestamp(start), _to_timestamp(end))
+            )
+        return _build_series(group_type, rows)
+
+    @staticmethod
+    def _read(connection: sqlite3.Connection, params: tuple[str, str, int, int]) -> list[tuple[str, int, float, str]]:
+        """Run a range scan, in the executor."""
+        return connection.execute(_SELECT_RANGE, params).fetchall()
+
+
+def _build_series(group_type: str, rows: list[tuple[str, int, float, str]]) -> MeasureSeries:
+    """Build a columnar series from rows ordered by period start."""
+    timestamps = sorted({timestamp for _, timestamp, _, _ in rows})
+    index = {timestamp: position for position, timestamp in enumerate(timestamps)}
+    series = MeasureSeries(group_type, [_from_timestamp(timestamp) for timestamp in timestamps])
+    for measure_type, timestamp, value, unit in rows:
+        column = series.values.get(measure_type)
+        if column is None:
+            column = series.values[measure_type] = [None] * len(timestamps)
+            series.units[measure_type] = unit
+        column[index[timestamp]] = value
+    return series
@@ -0,0 +1,169 @@
+"""Independently scheduled refresh groups of the coordinator."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from .api.exceptions import MyLightSystemsError
+from .const import MAX_BACKOFF_INTERVAL_IN_MINUTES, REFRESH_GROUP_TOLERANCE_IN_SECONDS, REPORT_POLL_DELAY_IN_SECONDS
+
+TOLERANCE = timedelta(seconds=REFRESH_GROUP_TOLERANCE_IN_SECONDS)
+POLL_DELAY = timedelta(seconds=REPORT_POLL_DELAY_IN_SECONDS)
+MAX_BACKOFF = timedelta(minutes=MAX_BACKOFF_INTERVAL_IN_MINUTES)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def phase_fraction(key: str) -> float:
+    """Return a fraction in [0, 1) that is stable for key across restarts."""
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:4], "big") / 2**32
+
+
+def error_message(exception: BaseException) -> str:
+    """Return a loggable description of a refresh error."""
+    if isinstance(exception, MyLightSystemsError):
+        return exception.msg
+    return str(exception) or type(exception).__name__
+
+
+class ReportPhase:
+    """Estimate of when the installation reports new data, learned from observed value changes."""
+
+    def __init__(self, period: timedelta) -> None:
+        """Initialize."""
+        self.period = period
+        # The last known report happened after _after and at the latest at _by.
+        self._after: datetime | None = None
+        self._by: datetime | None = None
+
+    @property
+    def window(self) -> tuple[datetime, datetime] | None:
+        """Return the bounds of the last known report."""
+        if self._after is None or self._by is None:
+            return None
+        return self._after, self._by
+
+    def observe(self, previous: datetime, now: datetime, changed: bool) -> None:
+        """Narrow the estimate with a poll at now, the previous one having been made at previous."""
+        if changed:
+            after, by = previous, now
+            if self._after is not None and self._by is not None:
+                # Project the known report onto this one and keep the intersection.
+                shift = self.period * round((now - self._by) / self.period)
+                after, by = max(after, self._after + shift), min(by, self._by + shift)
+                if after >= by:
+                    # The reports drifted: start again from this observation.
+                    after, by = previous, now
+            self._after, self._by = after, by
+            return
+
+        if self._after is None or self._by is None:
+            return
+        # Nothing was reported in (previous, now]: if that covers the start of an expected report, the report is later.
+        shift = self.period * max(1, math.ceil((now - self._by) / self.period))
+        if previous <= self._after + shift < now < self._by + shift:
+            self._after = now - shift
+
+    def next_report(self, not_before: datetime) -> datetime | None:
+        """Return the time by which the first report expected at or after not_before has happened."""
+        if self._by is None:
+            return None
+        return self._by + self.period * max(0, math.ceil((not_before - self._by) / self.period))
+
+
+@dataclass
+class RefreshGroup:
+    """Endpoints refreshed together on their own interval, with the results of their last success."""
+
+    name: str
+    interval: timedelta
+    fetch: Callable[[], Awaitable[Any]]
+    phase: ReportPhase | None = None
+    offset: timedelta = timedelta()
+    fields: tuple[str, ...] = ()
+    retry_interval: timedelta | None = None
+    results: Any = None
+    last_attempt: datetime | None = None
+    last_success: datetime | None = None
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    unchanged_polls: int = 0
+
+    def _slot(self, not_before: datetime) -> datetime:
+        """Return the first slot of the group at or after not_before, slots being offset multiples of the interval."""
+        return (
+            EPOCH
+            + self.offset
+            + self.interval * math.ceil((not_before - TOLERANCE - EPOCH - self.offset) / self.interval)
+        )
+
+    def next_due(self) -> datetime | None:
+        """Return when the group should be refreshed next, None meaning right away."""
+        if self.last_attempt is None:
+            return None
+        if self.consecutive_failures:
+            return self.last_attempt + self.backoff
+        # Keep to the slots of the group so that entries created together do not poll in lockstep.
+        due = self._slot(self.last_attempt + self.interval)
+        if self.results is None or self.phase is None:
+            return due
+        # Poll just after the first expected report once the interval elapsed, so no poll returns stale values.
+        report = self.phase.next_report(due - POLL_DELAY - TOLERANCE)
+        return due if report is None else report + POLL_DELAY
+
+    @property
+    def backoff(self) -> timedelta:
+        """Return the delay before retrying, doubling with each consecutive failure up to MAX_BACKOFF."""
+        retry_interval = self.retry_interval or self.interval
+        if retry_interval >= MAX_BACKOFF:
+            return retry_interval
+        return min(retry_interval * 2 ** min(self.consecutive_failures - 1, 16), MAX_BACKOFF)
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the group should be refreshed at now."""
+        due = self.next_due()
+        return due is None or now >= due - TOLERANCE
+
+    def invalidate(self) -> None:
+        """Make the group due on the next refresh."""
+        self.last_attempt = None
+
+    def record_success(self, now: datetime, results: Any) -> None:
+        """Keep the results of a successful refresh and learn from whether they changed."""
+        if self.results is not None and self.last_success is not None:
+            changed = results != self.results
+            if not changed:
+                self.unchanged_polls += 1
+            if self.phase is not None:
+                self.phase.observe(self.last_success, now, changed)
+        self.results = results
+        self.last_attempt = self.last_success = now
+        self.consecutive_failures = 0
+        self.last_error = None
+
+    def record_failure(self, now: datetime, exception: BaseException) -> None:
+        """Count a failed refresh, keeping the previous results."""
+        self.last_attempt = now
+        self.consecutive_failures += 1
+        self.last_error = error_message(exception)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return the schedule and failure state of the group."""
+        next_due = self.next_due()
+        window = self.phase.window if self.phase is not None else None
+        return {
+            "interval_seconds": self.interval.total_seconds(),
+            "offset_seconds": self.offset.total_seconds(),
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "next_due": next_due.isoformat() if next_due else None,
+            "report_window": [bound.isoformat() for bound in window] if window else None,
+            "unchanged_polls": self.unchanged_polls,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff_seconds": self.backoff.total_seconds() if self.consecutive_failures else None,
+            "last_error": self.last_error,
+        }
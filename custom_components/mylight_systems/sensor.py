@@ -29,6 +29,7 @@ class MyLightSensorEntityDescription(SensorEntityDescription):
     """Describes a sensor entity."""
 
     value_fn: Callable[[MyLightSystemsCoordinatorData], int | float | str | None]
+    data_fields: tuple[str, ...]
 
 
 def _calculate_grid_returned_energy(data: MyLightSystemsCoordinatorData) -> float | None:
@@ -44,6 +45,7 @@ def _calculate_grid_returned_energy(data: MyLightSystemsCoordinatorData) -> floa
 MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     MyLightSensorEntityDescription(
         key="total_solar_production",
+        data_fields=("produced_energy",),
         translation_key="total_solar_production",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -53,6 +55,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_grid_consumption",
+        data_fields=("grid_energy",),
         translation_key="total_grid_consumption",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -62,6 +65,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_grid_without_battery_consumption",
+        data_fields=("grid_energy_without_battery",),
         translation_key="total_grid_without_battery_consumption",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -73,6 +77,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_autonomy_rate",
+        data_fields=("autonomy_rate",),
         translation_key="total_autonomy_rate",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -83,6 +88,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_self_conso",
+        data_fields=("self_conso",),
         translation_key="total_self_conso",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -93,6 +99,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_msb_charge",
+        data_fields=("msb_charge",),
         translation_key="total_msb_charge",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -102,6 +109,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_msb_discharge",
+        data_fields=("msb_discharge",),
         translation_key="total_msb_discharge",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -111,6 +119,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="total_green_energy",
+        data_fields=("green_energy",),
         translation_key="total_green_energy",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -120,6 +129,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="battery_state",
+        data_fields=("battery_state",),
         translation_key="battery_state",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         state_class=SensorStateClass.MEASUREMENT,
@@ -129,6 +139,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="grid_returned_energy",
+        data_fields=("produced_energy", "green_energy", "msb_charge"),
         translation_key="grid_returned_energy",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -138,6 +149,7 @@ MYLIGHT_SENSORS: tuple[MyLightSensorEntityDescription, ...] = (
     ),
     MyLightSensorEntityDescription(
         key="water_heater_energy",
+        data_fields=("water_heater_energy",),
         translation_key="water_heater_energy",
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -178,7 +190,7 @@ class MyLightSystemsSensor(IntegrationMyLightSystemsEntity, SensorEntity):
         entity_description: MyLightSensorEntityDescription,
     ) -> None:
         """Init."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.data_fields)
         self._attr_unique_id = f"{entry_id}_{entity_description.key}"
         self.entity_description = entity_description
 
@@ -0,0 +1,106 @@
+"""Shared HTTP connection pools for MyLight Systems."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util.ssl import get_default_context
+
+from .api.ratelimit import TokenBucketRateLimiter
+from .const import (
+    CONNECTION_KEEPALIVE_TIMEOUT_IN_SECONDS,
+    CONNECTION_LIMIT_PER_HOST,
+    DATA_SESSIONS,
+    DNS_CACHE_TTL_IN_SECONDS,
+    LOGGER,
+)
+
+
+@dataclass
+class _Pool:
+    """A connection pool, the rate limiter shared by its users and the number of config entries holding it."""
+
+    session: aiohttp.ClientSession
+    rate_limiter: TokenBucketRateLimiter = field(default_factory=TokenBucketRateLimiter)
+    users: int = 0
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a session whose connections are kept alive and reused for the MyLight host."""
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT_IN_SECONDS,
+        ttl_dns_cache=DNS_CACHE_TTL_IN_SECONDS,
+        # A single SSL context for every connection; kept-alive connections skip the TLS handshake entirely.
+        ssl=get_default_context(),
+    )
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": SERVER_SOFTWARE})
+
+
+@callback
+def async_get_session(hass: HomeAssistant, base_url: str) -> aiohttp.ClientSession:
+    """Return the connection pool of a base URL, creating it on first use.
+
+    Diagnostics borrow the pool; config entries hold it with async_acquire_session.
+    """
+    if DATA_SESSIONS not in hass.data:
+        hass.data[DATA_SESSIONS] = {}
+
+        @callback
+        def _async_close_all(event: Event) -> None:
+            """Close every pool when Home Assistant stops."""
+            for remaining in hass.data.pop(DATA_SESSIONS, {}).values():
+                hass.async_create_task(remaining.session.close())
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_all)
+
+    pools: dict[str, _Pool] = hass.data[DATA_SESSIONS]
+    pool = pools.get(base_url)
+    if pool is None or pool.session.closed:
+        pool = pools[base_url] = _Pool(_create_session())
+        LOGGER.debug("Created connection pool for %s", base_url)
+    return pool.session
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, base_url: str) -> TokenBucketRateLimiter:
+    """Return the rate limiter of a base URL, which lives and goes with its connection pool."""
+    async_get_session(hass, base_url)
+    return hass.data[DATA_SESSIONS][base_url].rate_limiter
+
+
+@callback
+def async_acquire_session(hass: HomeAssistant, base_url: str) -> aiohttp.ClientSession:
+    """Return the connection pool of a base URL and keep it open until released."""
+    session = async_get_session(hass, base_url)
+    hass.data[DATA_SESSIONS][base_url].users += 1
+    return session
+
+
+async def async_release_session(hass: HomeAssistant, base_url: str) -> None:
+    """Release a pool acquired by a config entry, closing it when no entry holds it anymore."""
+    pools: dict[str, _Pool] = hass.data.get(DATA_SESSIONS, {})
+    pool = pools.get(base_url)
+    if pool is None:
+        return
+    pool.users -= 1
+    if pool.users <= 0:
+        del pools[base_url]
+        await pool.session.close()
+        LOGGER.debug("Closed connection pool for %s", base_url)
+
+
+@asynccontextmanager
+async def async_borrow_session(hass: HomeAssistant, base_url: str) -> AsyncIterator[aiohttp.ClientSession]:
+    """Hold the connection pool of a base URL for a block, closing it afterwards unless a config entry holds it."""
+    session = async_acquire_session(hass, base_url)
+    try:
+        yield session
+    finally:
+        await async_release_session(hass, base_url)
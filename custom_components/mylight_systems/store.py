@@ -0,0 +1,54 @@
+"""Persistent storage for MyLight Systems."""
+
+from __future__ import annotations
+
+from typing import Any, TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import STORAGE_KEY_BACKFILL, STORAGE_KEY_SNAPSHOT, STORAGE_KEY_TOKEN, STORAGE_VERSION
+
+
+class StoredToken(TypedDict):
+    """Auth token persisted for a config entry."""
+
+    email: str
+    auth_token: str
+    expires_at: str
+
+
+class StoredBackfill(TypedDict):
+    """Progress of the statistics backfill of a config entry."""
+
+    cursor: str
+    sums: dict[str, float]
+
+
+class StoredSnapshot(TypedDict):
+    """Last coordinator data of a config entry, with measures stored as dicts."""
+
+    saved_at: str
+    data: dict[str, Any]
+
+
+def token_store(hass: HomeAssistant, entry_id: str) -> Store[StoredToken]:
+    """Return the private store holding the auth token of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_TOKEN}.{entry_id}", private=True)
+
+
+def backfill_store(hass: HomeAssistant, entry_id: str) -> Store[StoredBackfill]:
+    """Return the store holding the statistics backfill checkpoint of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_BACKFILL}.{entry_id}")
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[StoredSnapshot]:
+    """Return the store holding the last coordinator data of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_SNAPSHOT}.{entry_id}")
+
+
+async def async_remove_stores(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove everything persisted for a config entry."""
+    await token_store(hass, entry_id).async_remove()
+    await backfill_store(hass, entry_id).async_remove()
+    await snapshot_store(hass, entry_id).async_remove()
@@ -59,7 +59,7 @@ class MyLightSystemsSwitch(IntegrationMyLightSystemsEntity, SwitchEntity):
         entity_description: MyLightSystemsSwitchEntityDescription,
     ) -> None:
         """Initialize MyLight Systems switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, ("master_relay_state",))
         self._attr_unique_id = f"{entry_id}_{entity_description.key}"
         self.entity_description: MyLightSystemsSwitchEntityDescription = entity_description
 
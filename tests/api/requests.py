@@ -0,0 +1,18 @@
+"""Helpers to inspect the requests recorded by aioresponses."""
+
+from __future__ import annotations
+
+from aioresponses import aioresponses
+from aioresponses.core import RequestCall
+
+
+def recorded_calls(session_mock: aioresponses, path: str | None = None) -> list[RequestCall]:
+    """Return the requests sent through session_mock, only those to path when given."""
+    requests = session_mock.requests
+    assert requests is not None
+    return [call for (_, url), calls in requests.items() if path is None or url.path == path for call in calls]
+
+
+def count_requests(session_mock: aioresponses, path: str | None = None) -> int:
+    """Return the number of requests sent through session_mock, only those to path when given."""
+    return len(recorded_calls(session_mock, path))
@@ -0,0 +1,149 @@
+"""Unit tests for the circuit breaker."""
+
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.circuit_breaker import CircuitBreaker, CircuitState
+from custom_components.mylight_systems.api.client import DEFAULT_BASE_URL, PROFILE_URL, MyLightApiClient
+from custom_components.mylight_systems.api.exceptions import CircuitOpenError, CommunicationError
+from tests.api.requests import count_requests
+
+TOKEN = "abcdef"  # noqa: S105
+PROFILE_REQUEST_URL = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={TOKEN}"
+MONOTONIC = "custom_components.mylight_systems.api.circuit_breaker.time.monotonic"
+
+
+def test_breaker__should_open_after_threshold_failures():
+    """Test that consecutive failures open the circuit and calls are rejected."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    breaker.record_failure()
+    assert CircuitState.CLOSED == breaker.state
+    breaker.record_failure()
+
+    assert CircuitState.OPEN == breaker.state
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert 1 == breaker.rejected
+
+
+def test_breaker__should_allow_a_single_trial_when_half_open():
+    """Test that only one trial request passes after the recovery timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    with patch(MONOTONIC, return_value=1000.0):
+        breaker.record_failure()
+
+    with patch(MONOTONIC, return_value=1060.0):
+        assert CircuitState.HALF_OPEN == breaker.state
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+
+def test_breaker__should_close_after_successful_trial():
+    """Test that a successful trial closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    with patch(MONOTONIC, return_value=1000.0):
+        breaker.record_failure()
+
+    with patch(MONOTONIC, return_value=1060.0):
+        breaker.before_call()
+        breaker.record_success()
+
+    assert CircuitState.CLOSED == breaker.state
+
+
+def test_breaker__should_reopen_after_failed_trial():
+    """Test that a failed trial opens the circuit again for a full recovery timeout."""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    with patch(MONOTONIC, return_value=1000.0):
+        for _ in range(3):
+            breaker.record_failure()
+
+    with patch(MONOTONIC, return_value=1060.0):
+        breaker.before_call()
+        breaker.record_failure()
+        assert CircuitState.OPEN == breaker.state
+        assert 60 == breaker.retry_in
+
+
+@pytest.mark.asyncio
+async def test_client__should_fail_fast_while_open():
+    """Test that the client stops sending requests once the circuit is open."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, circuit_breaker=breaker)
+        with aioresponses() as session_mock:
+            session_mock.get(PROFILE_REQUEST_URL, status=503, repeat=True)
+            for _ in range(2):
+                with pytest.raises(CommunicationError):
+                    await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+            with pytest.raises(CircuitOpenError):
+                await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+            request_count = count_requests(session_mock)
+
+    assert 2 == request_count
+    assert CircuitState.OPEN == api_client.circuit_state
+
+
+@pytest.mark.asyncio
+async def test_client__should_not_count_client_errors_as_outage():
+    """Test that 4xx responses do not open the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, circuit_breaker=breaker)
+        with aioresponses() as session_mock:
+            session_mock.get(PROFILE_REQUEST_URL, status=404)
+            with pytest.raises(CommunicationError):
+                await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+    assert CircuitState.CLOSED == api_client.circuit_state
+
+
+@pytest.mark.asyncio
+async def test_client__should_reopen_when_the_trial_raises_an_unexpected_error():
+    """Test that an unclassified error of the trial request opens the circuit again instead of blocking it."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    with patch(MONOTONIC, return_value=1000.0):
+        breaker.record_failure()
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, circuit_breaker=breaker)
+        with (
+            patch(MONOTONIC, return_value=1060.0),
+            patch.object(api_client, "_send_with_retries", side_effect=RuntimeError("boom")),
+            pytest.raises(RuntimeError),
+        ):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+    with patch(MONOTONIC, return_value=1120.0):
+        assert CircuitState.HALF_OPEN == breaker.state
+        assert breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_client__should_free_the_trial_slot_when_the_trial_is_cancelled():
+    """Test that a cancelled trial request lets the next request probe the API."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    with patch(MONOTONIC, return_value=1000.0):
+        breaker.record_failure()
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, circuit_breaker=breaker)
+        with (
+            patch(MONOTONIC, return_value=1060.0),
+            patch.object(api_client, "_send_with_retries", side_effect=asyncio.CancelledError()),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+        with patch(MONOTONIC, return_value=1060.0):
+            assert CircuitState.HALF_OPEN == breaker.state
+            assert breaker.before_call()
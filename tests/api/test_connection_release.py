@@ -0,0 +1,75 @@
+"""Leak-detection tests for connection release on error paths."""
+
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.mylight_systems.api.client import PROFILE_URL, MyLightApiClient
+from custom_components.mylight_systems.api.exceptions import CommunicationError
+from custom_components.mylight_systems.api.timeouts import RequestTimeout
+
+TOKEN = "abcdef"  # noqa: S105
+
+ERROR_RESPONSES = {
+    "server_error": lambda: web.Response(status=500, text="boom"),
+    "not_found": lambda: web.Response(status=404, text="missing"),
+    "html_body": lambda: web.Response(status=200, text="<html></html>", content_type="text/html"),
+    "invalid_json": lambda: web.Response(status=200, text="{not json", content_type="application/json"),
+}
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Start a local stand-in for the MyLight API answering with the scenario given in the query."""
+
+    async def _handler(request: web.Request) -> web.StreamResponse:
+        scenario = request.query.get("scenario", "ok")
+        if scenario == "ok":
+            return web.json_response({"status": "ok", "id": "abc", "gridType": "1 phase"})
+        if scenario == "stalled_body":
+            response = web.StreamResponse(headers={"Content-Type": "application/json"})
+            await response.prepare(request)
+            await response.write(b'{"status": ')
+            await asyncio.sleep(1)
+            return response
+        return ERROR_RESPONSES[scenario]()
+
+    app = web.Application()
+    app.router.add_get(PROFILE_URL, _handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create a session whose pool holds a single connection, so that one leak blocks every request."""
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1))
+    yield session
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_error_responses__should_release_the_connection(server, session):
+    """Test that every error path returns its connection to the pool."""
+    api_client = MyLightApiClient(
+        str(server.make_url("")),
+        session,
+        timeouts={PROFILE_URL: RequestTimeout(connect=2, first_byte=0.2, total=2)},
+    )
+
+    for _ in range(3):
+        for scenario in [*ERROR_RESPONSES, "stalled_body"]:
+            with pytest.raises(CommunicationError):
+                await api_client.async_raw_request(
+                    "get", PROFILE_URL, params={"authToken": TOKEN, "scenario": scenario}
+                )
+
+    # With a single-connection pool, this times out if any error path above leaked its connection.
+    result = await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+    assert "ok" == result["status"]
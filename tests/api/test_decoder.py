@@ -0,0 +1,90 @@
+"""Unit tests for JSON decoding and body fingerprinting."""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import aiohttp
+import orjson
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import DEFAULT_BASE_URL, MEASURES_TOTAL_URL, MyLightApiClient
+from custom_components.mylight_systems.api.decoder import fingerprint
+
+TOKEN = "abcdef"  # noqa: S105
+URL = DEFAULT_BASE_URL + MEASURES_TOTAL_URL + f"?authToken={TOKEN}&deviceId=dev-1&measureType=one_phase"
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def json_loads():
+    """Create a JSON decoder spy."""
+    return MagicMock(side_effect=json.loads)
+
+
+@pytest.fixture
+def api_client(session, json_loads):
+    """Create a MyLightApiClient instance using the decoder spy."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session, json_loads=json_loads)
+
+
+@pytest.fixture
+def valid_measures_total_fixture():
+    """Load valid measures total response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/measures_total/ok.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.mark.asyncio
+async def test_client__should_decode_with_orjson_by_default(session):
+    """Test that the client decodes with orjson unless a decoder is given."""
+    assert MyLightApiClient(DEFAULT_BASE_URL, session)._json_loads is orjson.loads
+
+
+def test_fingerprint__should_only_match_identical_bodies():
+    """Test that the digest identifies a body."""
+    assert fingerprint(b'{"a": 1}') == fingerprint(b'{"a": 1}')
+    assert fingerprint(b'{"a": 1}') != fingerprint(b'{"a": 2}')
+
+
+@pytest.mark.asyncio
+async def test_client__should_reuse_model_when_body_is_unchanged(api_client, json_loads, valid_measures_total_fixture):
+    """Test that an unchanged body is neither decoded nor rebuilt into measures."""
+    with aioresponses() as session_mock:
+        session_mock.get(URL, status=200, body=json.dumps(valid_measures_total_fixture), repeat=True)
+
+        first = await api_client.async_get_measures_total(TOKEN, "one_phase", "dev-1")
+        second = await api_client.async_get_measures_total(TOKEN, "one_phase", "dev-1")
+
+    assert first is second
+    assert 1 == json_loads.call_count
+    assert 1 == api_client.metrics["decodes_skipped"]
+
+
+@pytest.mark.asyncio
+async def test_client__should_decode_changed_body(api_client, json_loads, valid_measures_total_fixture):
+    """Test that a changed body is decoded and parsed again."""
+    changed = json.loads(json.dumps(valid_measures_total_fixture))
+    changed["measure"]["values"][0]["value"] += 1
+
+    with aioresponses() as session_mock:
+        session_mock.get(URL, status=200, body=json.dumps(valid_measures_total_fixture))
+        session_mock.get(URL, status=200, body=json.dumps(changed))
+
+        first = await api_client.async_get_measures_total(TOKEN, "one_phase", "dev-1")
+        second = await api_client.async_get_measures_total(TOKEN, "one_phase", "dev-1")
+
+    assert first is not second
+    assert first[0].value + 1 == second[0].value
+    assert 2 == json_loads.call_count
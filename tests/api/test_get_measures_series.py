@@ -0,0 +1,180 @@
+"""Unit tests for the get measures series API."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    MEASURES_GROUPING_URL,
+    MyLightApiClient,
+)
+from custom_components.mylight_systems.api.exceptions import UnauthorizedError
+from custom_components.mylight_systems.api.models import Measure
+from custom_components.mylight_systems.api.periods import period_starts
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def api_client(session):
+    """Create a MyLightApiClient instance for testing."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session)
+
+
+def _load_fixture(name):
+    """Load a measures grouping fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + f"/fixtures/measures_grouping/{name}")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _load_hourly_fixture():
+    """Load the hourly fixture, completed to the 24 hours of a day with groups without values."""
+    payload = _load_fixture("ok_hourly.json")
+    payload["measures"] += [{"values": []} for _ in range(24 - len(payload["measures"]))]
+    return payload
+
+
+def _build_url(token, measure_type, device_id, from_date, to_date, group_type):
+    """Build the expected URL for the grouping endpoint."""
+    return (
+        DEFAULT_BASE_URL
+        + MEASURES_GROUPING_URL
+        + f"?authToken={token}&groupType={group_type}&fromDate={from_date}&toDate={to_date}"
+        + f"&measureType={measure_type}&deviceId={device_id}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_get_measures_series__should_return_every_group_as_columns(api_client):
+    """Test async_get_measures_series returns all groups indexed by their start time."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = _build_url(token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", "hour")
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=_load_hourly_fixture())
+
+        series = await api_client.async_get_measures_series(
+            token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", group_type="hour"
+        )
+
+    # Then
+    assert len(series) == 24
+    assert series.timestamps[:3] == [datetime(2026, 3, 27, 0), datetime(2026, 3, 27, 1), datetime(2026, 3, 27, 2)]
+    assert series.timestamps[-1] == datetime(2026, 3, 27, 23)
+    assert series.column("produced_energy")[:4] == [0.0, 3.6e6, 7.2e6, None]
+    assert series.column("msb_charge")[:3] == [None, None, 1.2e6]
+    assert series.column("unknown") == [None] * 24
+    assert series.units["grid_energy"] == "Ws"
+    assert series.measures_at(0) == [Measure("produced_energy", 0.0, "Ws"), Measure("grid_energy", 1.8e6, "Ws")]
+
+
+@pytest.mark.asyncio
+async def test_async_get_measures_series__should_ignore_a_range_with_missing_groups(api_client, caplog):
+    """Test async_get_measures_series does not date the groups of an incomplete range by position."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = _build_url(token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", "hour")
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=_load_fixture("ok_hourly.json"))
+
+        series = await api_client.async_get_measures_series(
+            token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", group_type="hour"
+        )
+
+    # Then
+    assert len(series) == 0
+    assert "expected 24 groups, received 3" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_async_get_measures_series__should_return_empty_series_when_no_groups(api_client):
+    """Test async_get_measures_series returns an empty series when the range has no data."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = _build_url(token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", "day")
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload={"status": "ok", "measures": []})
+
+        series = await api_client.async_get_measures_series(
+            token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28"
+        )
+
+    # Then
+    assert len(series) == 0
+    assert series.values == {}
+
+
+@pytest.mark.asyncio
+async def test_async_get_measures_series__should_raise_unauthorized_exception_when_invalid_token(api_client):
+    """Test async_get_measures_series raises UnauthorizedError with invalid token."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = _build_url(token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28", "day")
+
+    # When / Then
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=_load_fixture("unauthorized.json"))
+
+        with pytest.raises(UnauthorizedError):
+            await api_client.async_get_measures_series(
+                token, "one_phase", "qVGSJ45vkeqvrHy6g", "2026-03-27", "2026-03-28"
+            )
+
+
+@pytest.mark.parametrize(
+    ("group_type", "start", "expected"),
+    [
+        ("day", datetime(2026, 2, 27), [datetime(2026, 2, 27), datetime(2026, 2, 28), datetime(2026, 3, 1)]),
+        ("month", datetime(2025, 11, 15), [datetime(2025, 11, 15), datetime(2025, 12, 1), datetime(2026, 1, 1)]),
+        ("year", datetime(2025, 6, 1), [datetime(2025, 6, 1), datetime(2026, 1, 1), datetime(2027, 1, 1)]),
+    ],
+)
+def test_period_starts__should_follow_the_calendar(group_type, start, expected):
+    """Test period_starts steps by fixed durations and by calendar months and years."""
+    assert period_starts(start, group_type, 3) == expected
+
+
+def test_period_starts__should_keep_hours_one_hour_apart_across_dst_change():
+    """Test period_starts counts hours of an aware start in real time across the autumn DST change."""
+    # Given
+    paris = ZoneInfo("Europe/Paris")
+    start = datetime(2025, 10, 26, 1, tzinfo=paris)
+
+    # When
+    starts = period_starts(start, "hour", 4)
+
+    # Then
+    assert [timestamp.timestamp() - start.timestamp() for timestamp in starts] == [0, 3600, 7200, 10800]
+    assert [(timestamp.hour, timestamp.utcoffset()) for timestamp in starts] == [
+        (1, timedelta(hours=2)),
+        (2, timedelta(hours=2)),
+        (2, timedelta(hours=1)),
+        (3, timedelta(hours=1)),
+    ]
+
+
+def test_period_starts__should_reject_unknown_group_type():
+    """Test period_starts rejects group types the endpoint does not support."""
+    with pytest.raises(ValueError):
+        period_starts(datetime(2026, 1, 1), "week", 1)
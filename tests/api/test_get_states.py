@@ -0,0 +1,97 @@
+"""Unit tests for the get states API."""
+
+import json
+import os
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    STATES_URL,
+    MyLightApiClient,
+)
+from custom_components.mylight_systems.api.exceptions import UnauthorizedError
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def api_client(session):
+    """Create a MyLightApiClient instance for testing."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session)
+
+
+@pytest.fixture
+def unauthorized_response_fixture():
+    """Load unauthorized response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/states/unauthorized.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def valid_states_response_fixture():
+    """Load valid states response fixture with a battery and a relay."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/states/ok_mixed.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.mark.asyncio
+async def test_get_states__should_raise_unauthorized_exception_when_invalid_token(
+    api_client, unauthorized_response_fixture
+):
+    """Test with invalid token should raise UnauthorizedException."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={token}"
+
+    # When / Then
+    with aioresponses() as session_mock:
+        session_mock.get(
+            url,
+            status=200,
+            payload=unauthorized_response_fixture,
+        )
+
+        with pytest.raises(UnauthorizedError):
+            await api_client.async_get_states(token)
+
+
+@pytest.mark.asyncio
+async def test_get_states__should_index_devices_and_sensors(api_client, valid_states_response_fixture):
+    """Test a single states response exposes both battery SOC and relay state."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(
+            url,
+            status=200,
+            payload=valid_states_response_fixture,
+        )
+
+        states = await api_client.async_get_states(token)
+
+    # Then
+    assert {"bat-001": "active", "relay-001": "on"} == states.devices
+    soc = states.get_battery_soc("bat-001")
+    assert soc is not None
+    assert "battery_soc" == soc.type
+    assert 75.5 == soc.value
+    assert "on" == states.get_device_state("relay-001")
+    assert states.get_device_state("unknown") is None
+    assert states.get_battery_soc("unknown") is None
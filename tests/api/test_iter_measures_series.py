@@ -0,0 +1,134 @@
+"""Unit tests for the chunked measures series iterator."""
+
+import asyncio
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mylight_systems.api.client import DEFAULT_BASE_URL, MyLightApiClient
+from custom_components.mylight_systems.api.models import MeasureSeries
+from custom_components.mylight_systems.api.periods import history_windows
+
+
+class _FakeSeriesApi:
+    """Replacement for async_get_measures_series completing windows in reverse order."""
+
+    def __init__(self) -> None:
+        self.requested: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        self.stall_after_first = False
+
+    async def __call__(self, auth_token, phase, device_id, from_date, to_date, group_type, use_cache=True):
+        self.requested.append((from_date, to_date))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.stall_after_first and len(self.requested) > 1:
+                await asyncio.sleep(10)
+            # Later windows finish first.
+            await asyncio.sleep(0.01 / len(self.requested))
+            return MeasureSeries(group_type)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """Create an API client whose series requests are faked."""
+    fake = _FakeSeriesApi()
+    client = MyLightApiClient(DEFAULT_BASE_URL, session=MagicMock())
+    monkeypatch.setattr(client, "async_get_measures_series", fake)
+    return client, fake
+
+
+@pytest.mark.asyncio
+async def test_async_iter_measures_series__should_yield_windows_in_order_with_bounded_concurrency(fake_api):
+    # Given
+    client, fake = fake_api
+
+    # When
+    windows = [
+        window
+        async for window in client.async_iter_measures_series(
+            "token", "one_phase", "device", "2026-01-01", "2026-01-29", group_type="hour", concurrency=2
+        )
+    ]
+
+    # Then
+    assert [window.cursor for window in windows] == ["2026-01-08", "2026-01-15", "2026-01-22", "2026-01-29"]
+    assert windows[0].start == date(2026, 1, 1)
+    assert fake.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_async_iter_measures_series__should_resume_from_cursor(fake_api):
+    # Given
+    client, fake = fake_api
+    iterator = client.async_iter_measures_series(
+        "token", "one_phase", "device", "2026-01-01", "2026-01-29", group_type="hour"
+    )
+    cursor = (await anext(iterator)).cursor
+    await iterator.aclose()
+    fake.requested.clear()
+
+    # When
+    windows = [
+        window
+        async for window in client.async_iter_measures_series(
+            "token", "one_phase", "device", cursor, "2026-01-29", group_type="hour"
+        )
+    ]
+
+    # Then
+    assert fake.requested[0] == ("2026-01-08", "2026-01-15")
+    assert windows[-1].cursor == "2026-01-29"
+
+
+@pytest.mark.asyncio
+async def test_async_iter_measures_series__should_cancel_windows_fetched_ahead_when_closed(fake_api):
+    # Given
+    client, fake = fake_api
+    fake.stall_after_first = True
+    iterator = client.async_iter_measures_series(
+        "token", "one_phase", "device", "2026-01-01", "2026-03-01", group_type="hour", concurrency=3
+    )
+
+    # When
+    await anext(iterator)
+    await iterator.aclose()
+
+    # Then
+    assert fake.in_flight == 0
+    assert fake.cancelled == 2
+
+
+@pytest.mark.parametrize(
+    ("group_type", "start", "end", "expected"),
+    [
+        (
+            "day",
+            date(2026, 1, 1),
+            date(2026, 6, 1),
+            [(date(2026, 1, 1), date(2026, 4, 3)), (date(2026, 4, 3), date(2026, 6, 1))],
+        ),
+        (
+            "month",
+            date(2024, 6, 15),
+            date(2026, 3, 1),
+            [
+                (date(2024, 6, 15), date(2025, 6, 1)),
+                (date(2025, 6, 1), date(2026, 3, 1)),
+            ],
+        ),
+        ("hour", date(2026, 1, 1), date(2026, 1, 1), []),
+    ],
+)
+def test_history_windows__should_split_range_for_group_type(group_type, start, end, expected):
+    """Test history_windows covers the range without overlap and aligns calendar windows."""
+    assert list(history_windows(start, end, group_type)) == expected
@@ -0,0 +1,77 @@
+"""Unit tests for the token bucket rate limiter."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import DEFAULT_BASE_URL, PROFILE_URL, MyLightApiClient
+from custom_components.mylight_systems.api.ratelimit import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLLING,
+    TokenBucketRateLimiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_acquire__should_not_wait_within_burst():
+    """Test that requests within the burst size are served immediately."""
+    limiter = TokenBucketRateLimiter(rate=1, burst=3)
+
+    waits = [await limiter.acquire() for _ in range(3)]
+
+    assert [0.0, 0.0, 0.0] == waits
+    assert 0 == limiter.metrics["queued"]
+
+
+@pytest.mark.asyncio
+async def test_acquire__should_serve_commands_before_polling():
+    """Test that a command queued after polling requests jumps ahead of them."""
+    limiter = TokenBucketRateLimiter(rate=50, burst=1)
+    await limiter.acquire()
+    order: list[str] = []
+
+    async def _request(name: str, priority: int) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    polling = [asyncio.create_task(_request(f"poll{i}", PRIORITY_POLLING)) for i in range(2)]
+    await asyncio.sleep(0)
+    command = asyncio.create_task(_request("command", PRIORITY_COMMAND))
+    await asyncio.gather(*polling, command)
+
+    assert ["command", "poll0", "poll1"] == order
+    assert 3 == limiter.metrics["queued"]
+    assert limiter.metrics["max_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_acquire__should_skip_cancelled_waiters():
+    """Test that a cancelled waiter does not consume a token."""
+    limiter = TokenBucketRateLimiter(rate=50, burst=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    waited = await limiter.acquire()
+
+    assert waited < 0.1
+    assert 0 == limiter.metrics["waiting"]
+
+
+@pytest.mark.asyncio
+async def test_client__should_report_rate_limiter_metrics():
+    """Test that the client acquires a token per request and exposes the limiter metrics."""
+    limiter = TokenBucketRateLimiter(rate=10, burst=5)
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={token}"
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, rate_limiter=limiter)
+        with aioresponses() as session_mock:
+            session_mock.get(url, status=200, payload={"status": "ok"})
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token})
+
+    assert 1 == api_client.metrics["rate_limiter"]["acquired"]
@@ -0,0 +1,105 @@
+"""Unit tests for in-flight request coalescing."""
+
+import asyncio
+import json
+import os
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    PROFILE_URL,
+    SWITCH_URL,
+    MyLightApiClient,
+)
+from tests.api.requests import count_requests
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def api_client(session):
+    """Create a MyLightApiClient instance for testing."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session)
+
+
+@pytest.fixture
+def valid_profile_fixture():
+    """Load valid profile response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/profile/ok_one_phase.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests__should_share_one_round_trip(api_client, valid_profile_fixture):
+    """Test that identical concurrent GETs are sent once and share the parsed result."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=valid_profile_fixture)
+        results = await asyncio.gather(
+            api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token}),
+            api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token}),
+            api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token}),
+        )
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 1 == request_count
+    assert results[0] is results[1] is results[2]
+    assert 2 == api_client.deduplicated_requests
+    assert 2 == api_client.metrics["deduplicated_requests"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests__should_not_be_coalesced(api_client, valid_profile_fixture):
+    """Test that a request issued after the previous one completed hits the API again."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=valid_profile_fixture, repeat=True)
+        await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token})
+        await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token})
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 2 == request_count
+    assert 0 == api_client.deduplicated_requests
+
+
+@pytest.mark.asyncio
+async def test_switch_commands__should_not_be_coalesced(api_client):
+    """Test that concurrent switch commands are each sent to the API."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + SWITCH_URL + f"?authToken={token}&id=relay-001&on=true"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload={"status": "ok", "state": "on"}, repeat=True)
+        await asyncio.gather(
+            api_client.async_turn_on(token, "relay-001"),
+            api_client.async_turn_on(token, "relay-001"),
+        )
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 2 == request_count
+    assert 0 == api_client.deduplicated_requests
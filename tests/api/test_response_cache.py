@@ -0,0 +1,207 @@
+"""Unit tests for the response cache."""
+
+import json
+import os
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.cache import ResponseCache, cache_ttls_for_report_period
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    PROFILE_URL,
+    STATES_URL,
+    SWITCH_URL,
+    MyLightApiClient,
+)
+from tests.api.requests import count_requests
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def api_client(session):
+    """Create a MyLightApiClient instance with a response cache for testing."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session, cache=ResponseCache())
+
+
+@pytest.fixture
+def valid_profile_fixture():
+    """Load valid profile response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/profile/ok_one_phase.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def valid_states_fixture():
+    """Load valid states response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/states/ok_mixed.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_cache__should_expire_entries_after_endpoint_ttl():
+    """Test that an entry is served until its TTL elapses."""
+    cache = ResponseCache({STATES_URL: 60})
+
+    with patch("custom_components.mylight_systems.api.cache.time.monotonic", return_value=1000.0):
+        cache.set("key", STATES_URL, {"status": "ok"})
+        assert (True, {"status": "ok"}) == cache.get("key")
+
+    with patch("custom_components.mylight_systems.api.cache.time.monotonic", return_value=1060.0):
+        assert (False, None) == cache.get("key")
+
+    assert 1 == cache.hits
+    assert 1 == cache.misses
+
+
+def test_cache__should_evict_least_recently_used_entry():
+    """Test that the cache stays within its size bound."""
+    cache = ResponseCache({STATES_URL: 60}, max_size=2)
+
+    cache.set("a", STATES_URL, 1)
+    cache.set("b", STATES_URL, 2)
+    cache.get("a")
+    cache.set("c", STATES_URL, 3)
+
+    assert 2 == len(cache)
+    assert (True, 1) == cache.get("a")
+    assert (False, None) == cache.get("b")
+    assert (True, 3) == cache.get("c")
+
+
+def test_cache__should_not_store_endpoints_without_ttl():
+    """Test that endpoints missing from the TTL mapping are never cached."""
+    cache = ResponseCache({STATES_URL: 60})
+
+    cache.set("key", SWITCH_URL, {"status": "ok"})
+
+    assert not cache.is_cacheable(SWITCH_URL)
+    assert 0 == len(cache)
+
+
+def test_cache__should_invalidate_only_given_endpoints():
+    """Test that invalidation drops only entries of the given endpoints."""
+    cache = ResponseCache({STATES_URL: 60, PROFILE_URL: 60})
+    cache.set("states", STATES_URL, 1)
+    cache.set("profile", PROFILE_URL, 2)
+
+    cache.invalidate(STATES_URL)
+
+    assert (False, None) == cache.get("states")
+    assert (True, 2) == cache.get("profile")
+
+
+def test_cache_ttls_for_report_period__should_only_change_report_period_endpoints():
+    """Test that the report period drives measures and states TTLs only."""
+    ttls = cache_ttls_for_report_period(300)
+
+    assert 300 == ttls[STATES_URL]
+    assert 3600 == ttls[PROFILE_URL]
+
+
+@pytest.mark.asyncio
+async def test_client__should_serve_repeated_reads_from_cache(api_client, valid_profile_fixture):
+    """Test that a second identical read does not hit the API."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=valid_profile_fixture, repeat=True)
+        first = await api_client.async_get_profile(token)
+        second = await api_client.async_get_profile(token)
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 1 == request_count
+    assert first == second
+    assert 1 == api_client.metrics["cache_hits"]
+
+
+@pytest.mark.asyncio
+async def test_client__raw_request_should_bypass_cache_on_demand(api_client, valid_profile_fixture):
+    """Test that async_raw_request(use_cache=False) always hits the API."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=valid_profile_fixture, repeat=True)
+        await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token})
+        await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": token}, use_cache=False)
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 2 == request_count
+
+
+@pytest.mark.asyncio
+async def test_client__get_states_should_bypass_cache_on_demand(api_client, valid_states_fixture):
+    """Test that async_get_states(use_cache=False) hits the API even while a cached response is fresh."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload=valid_states_fixture, repeat=True)
+        await api_client.async_get_states(token)
+        await api_client.async_get_states(token, use_cache=False)
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 2 == request_count
+
+
+@pytest.mark.asyncio
+async def test_client__switch_command_should_invalidate_states(api_client, valid_states_fixture):
+    """Test that turning a relay on drops the cached states."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    states_url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={token}"
+    switch_url = DEFAULT_BASE_URL + SWITCH_URL + f"?authToken={token}&id=relay-001&on=true"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(states_url, status=200, payload=valid_states_fixture, repeat=True)
+        session_mock.get(switch_url, status=200, payload={"status": "ok", "state": "on"})
+        await api_client.async_get_states(token)
+        await api_client.async_turn_on(token, "relay-001")
+        await api_client.async_get_states(token)
+        states_request_count = count_requests(session_mock, STATES_URL)
+
+    # Then
+    assert 2 == states_request_count
+
+
+@pytest.mark.asyncio
+async def test_client__should_not_cache_error_responses(api_client):
+    """Test that error payloads are not cached."""
+    # Given
+    token = "abcdef"  # noqa: S105
+    url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={token}"
+
+    # When
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=200, payload={"status": "error", "error": "other"}, repeat=True)
+        await api_client.async_raw_request("get", STATES_URL, params={"authToken": token})
+        await api_client.async_raw_request("get", STATES_URL, params={"authToken": token})
+        request_count = count_requests(session_mock)
+
+    # Then
+    assert 2 == request_count
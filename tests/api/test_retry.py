@@ -0,0 +1,170 @@
+"""Unit tests for the retry policy."""
+
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    PROFILE_URL,
+    SWITCH_URL,
+    MyLightApiClient,
+)
+from custom_components.mylight_systems.api.exceptions import CommunicationError
+from custom_components.mylight_systems.api.retry import RetryBudget, RetryPolicy, parse_retry_after
+from tests.api.requests import count_requests
+
+TOKEN = "abcdef"  # noqa: S105
+PROFILE_REQUEST_URL = DEFAULT_BASE_URL + PROFILE_URL + f"?authToken={TOKEN}"
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Create an aiohttp session for testing."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+def api_client(session):
+    """Create a MyLightApiClient instance with a retry policy for testing."""
+    return MyLightApiClient(DEFAULT_BASE_URL, session, retry_policy=RetryPolicy(base_delay=0, retry_budget=10))
+
+
+@pytest.fixture
+def valid_profile_fixture():
+    """Load valid profile response fixture."""
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fixture_path = os.path.normcase(dir_path + "/fixtures/profile/ok_one_phase.json")
+    with open(fixture_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_backoff__should_stay_within_exponential_ceiling():
+    """Test that jittered delays never exceed the exponential ceiling or max_delay."""
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    for _ in range(50):
+        assert 0 <= policy.backoff(1) <= 1
+        assert 0 <= policy.backoff(2) <= 2
+        assert 0 <= policy.backoff(10) <= 5
+
+
+def test_retry_budget__should_deny_once_spent_until_reset():
+    """Test that the budget caps retries until it is reset."""
+    budget = RetryBudget(1)
+
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.reset()
+    assert budget.try_spend()
+
+
+def test_parse_retry_after__should_accept_seconds_and_http_dates():
+    """Test both Retry-After formats."""
+    assert 5.0 == parse_retry_after("5")
+    assert 0.0 == parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT")
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_client__should_retry_transient_failure(api_client, valid_profile_fixture):
+    """Test that a timeout followed by a success returns the data."""
+    with aioresponses() as session_mock:
+        session_mock.get(PROFILE_REQUEST_URL, exception=TimeoutError())
+        session_mock.get(PROFILE_REQUEST_URL, status=200, payload=valid_profile_fixture)
+
+        result = await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+    assert result == valid_profile_fixture
+    assert 1 == api_client.metrics["retries"]
+
+
+@pytest.mark.asyncio
+async def test_client__should_give_up_after_max_attempts(api_client):
+    """Test that a persistent failure raises CommunicationError after max_attempts."""
+    with aioresponses() as session_mock:
+        session_mock.get(PROFILE_REQUEST_URL, status=502, repeat=True)
+
+        with pytest.raises(CommunicationError):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+        request_count = count_requests(session_mock)
+
+    assert 3 == request_count
+
+
+@pytest.mark.asyncio
+async def test_client__should_not_retry_client_errors(api_client):
+    """Test that a non-transient status is not retried."""
+    with aioresponses() as session_mock:
+        session_mock.get(PROFILE_REQUEST_URL, status=404, repeat=True)
+
+        with pytest.raises(CommunicationError):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+        request_count = count_requests(session_mock)
+
+    assert 1 == request_count
+
+
+@pytest.mark.asyncio
+async def test_client__should_not_retry_malformed_bodies(api_client):
+    """Test that an undecodable 200 response fails without spending the retry budget."""
+    with aioresponses() as session_mock:
+        session_mock.get(PROFILE_REQUEST_URL, status=200, body="{not json", repeat=True)
+
+        with pytest.raises(CommunicationError):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+        request_count = count_requests(session_mock)
+
+    assert 1 == request_count
+    assert 0 == api_client.metrics["retries"]
+
+
+@pytest.mark.asyncio
+async def test_client__should_honor_retry_after(api_client, valid_profile_fixture):
+    """Test that the Retry-After header of a 429 drives the retry delay."""
+    sleep = AsyncMock()
+    with aioresponses() as session_mock, patch("custom_components.mylight_systems.api.client.asyncio.sleep", sleep):
+        session_mock.get(PROFILE_REQUEST_URL, status=429, headers={"Retry-After": "7"})
+        session_mock.get(PROFILE_REQUEST_URL, status=200, payload=valid_profile_fixture)
+
+        await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+
+    sleep.assert_awaited_once_with(7.0)
+
+
+@pytest.mark.asyncio
+async def test_client__should_stop_retrying_when_budget_is_spent(session):
+    """Test that retries stop once the per-cycle budget is exhausted."""
+    api_client = MyLightApiClient(DEFAULT_BASE_URL, session, retry_policy=RetryPolicy(base_delay=0, retry_budget=1))
+
+    with aioresponses() as session_mock:
+        session_mock.get(PROFILE_REQUEST_URL, status=503, repeat=True)
+
+        with pytest.raises(CommunicationError):
+            await api_client.async_raw_request("get", PROFILE_URL, params={"authToken": TOKEN})
+        request_count = count_requests(session_mock)
+
+    assert 2 == request_count
+
+
+@pytest.mark.asyncio
+async def test_client__should_not_retry_switch_commands(api_client):
+    """Test that non-idempotent switch commands are sent only once."""
+    url = DEFAULT_BASE_URL + SWITCH_URL + f"?authToken={TOKEN}&id=relay-001&on=true"
+
+    with aioresponses() as session_mock:
+        session_mock.get(url, status=503, repeat=True)
+
+        with pytest.raises(CommunicationError):
+            await api_client.async_turn_on(TOKEN, "relay-001")
+        request_count = count_requests(session_mock)
+
+    assert 1 == request_count
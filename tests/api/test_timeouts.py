@@ -0,0 +1,79 @@
+"""Unit tests for per-endpoint request timeouts."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from custom_components.mylight_systems.api.client import (
+    DEFAULT_BASE_URL,
+    MEASURES_GROUPING_URL,
+    STATES_URL,
+    MyLightApiClient,
+)
+from custom_components.mylight_systems.api.singleflight import SingleFlight
+from custom_components.mylight_systems.api.timeouts import (
+    DEFAULT_ENDPOINT_TIMEOUTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    RequestTimeout,
+)
+from tests.api.requests import recorded_calls
+
+TOKEN = "abcdef"  # noqa: S105
+
+
+def test_endpoint_timeouts__should_give_large_payloads_a_larger_budget():
+    """Test that grouping requests get more time than the default profile."""
+    assert DEFAULT_ENDPOINT_TIMEOUTS[MEASURES_GROUPING_URL].total > DEFAULT_REQUEST_TIMEOUT.total
+    assert STATES_URL not in DEFAULT_ENDPOINT_TIMEOUTS
+
+
+def test_request_timeout__should_map_phases_to_client_timeout():
+    """Test that connect and first-byte budgets are enforced by aiohttp."""
+    client_timeout = RequestTimeout(connect=1, first_byte=2, total=3).to_client_timeout()
+
+    assert 1 == client_timeout.connect
+    assert 2 == client_timeout.sock_read
+
+
+@pytest.mark.asyncio
+async def test_client__should_send_the_endpoint_timeout_profile():
+    """Test that the client passes the configured profile of the endpoint to aiohttp."""
+    url = DEFAULT_BASE_URL + STATES_URL + f"?authToken={TOKEN}"
+    timeouts = {STATES_URL: RequestTimeout(connect=1, first_byte=2, total=3)}
+
+    async with aiohttp.ClientSession() as session:
+        api_client = MyLightApiClient(DEFAULT_BASE_URL, session, timeouts=timeouts)
+        with aioresponses() as session_mock:
+            session_mock.get(url, status=200, payload={"status": "ok"})
+            await api_client.async_raw_request("get", STATES_URL, params={"authToken": TOKEN})
+            (call,) = recorded_calls(session_mock)
+
+    assert 1 == call.kwargs["timeout"].connect
+    assert 2 == call.kwargs["timeout"].sock_read
+
+
+@pytest.mark.asyncio
+async def test_single_flight__should_cancel_call_once_every_caller_gave_up():
+    """Test that a shared call is cancelled when its last waiter is cancelled."""
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _slow() -> None:
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [asyncio.create_task(single_flight.run("key", _slow)) for _ in range(2)]
+    await started.wait()
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    waiters[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,101 @@
+"""Unit tests for the shared token cache."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.mylight_systems.api.exceptions import InvalidCredentialsError
+from custom_components.mylight_systems.api.models import Login
+from custom_components.mylight_systems.auth import CachedToken, TokenCache, async_get_token_cache
+
+BASE_URL = "https://myhome.mylight-systems.com"
+
+
+def _make_mock_client() -> MagicMock:
+    """Create a mock API client whose login takes a loop iteration."""
+    client = MagicMock()
+    client.base_url = BASE_URL
+
+    async def _login(email, password):
+        await asyncio.sleep(0)
+        return Login(auth_token=f"token-{client.async_login.await_count}")
+
+    client.async_login = AsyncMock(side_effect=_login)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_login__should_collapse_concurrent_logins_for_the_same_account():
+    # Given
+    cache = TokenCache()
+    client = _make_mock_client()
+
+    # When
+    tokens = await asyncio.gather(*(cache.async_login(client, "test@example.com", "secret") for _ in range(3)))
+
+    # Then
+    client.async_login.assert_awaited_once()
+    assert {token.auth_token for token in tokens} == {"token-1"}
+    assert cache.get(BASE_URL, "test@example.com") == tokens[0]
+
+
+@pytest.mark.asyncio
+async def test_login__should_not_cache_rejected_credentials():
+    # Given
+    cache = TokenCache()
+    client = _make_mock_client()
+    client.async_login.side_effect = InvalidCredentialsError()
+
+    # When / Then
+    with pytest.raises(InvalidCredentialsError):
+        await cache.async_login(client, "test@example.com", "wrong")
+    assert cache.get(BASE_URL, "test@example.com") is None
+
+
+def test_get__should_key_tokens_by_base_url_and_email():
+    # Given
+    cache = TokenCache()
+    token = CachedToken("token-1", datetime.now(UTC) + timedelta(hours=1))
+
+    # When
+    cache.set(BASE_URL, "test@example.com", token)
+
+    # Then
+    assert cache.get(BASE_URL, "test@example.com") == token
+    assert cache.get(BASE_URL, "other@example.com") is None
+    assert cache.get("https://other.example.com", "test@example.com") is None
+
+
+def test_get__should_ignore_tokens_about_to_expire():
+    # Given
+    cache = TokenCache()
+    cache.set(BASE_URL, "test@example.com", CachedToken("token-1", datetime.now(UTC) + timedelta(seconds=30)))
+
+    # When / Then
+    assert cache.get(BASE_URL, "test@example.com") is None
+
+
+def test_invalidate__should_keep_a_token_that_already_replaced_the_rejected_one():
+    # Given
+    cache = TokenCache()
+    token = CachedToken("token-2", datetime.now(UTC) + timedelta(hours=1))
+    cache.set(BASE_URL, "test@example.com", token)
+
+    # When
+    cache.invalidate(BASE_URL, "test@example.com", "token-1")
+
+    # Then
+    assert cache.get(BASE_URL, "test@example.com") == token
+
+
+def test_get_token_cache__should_return_one_cache_per_hass():
+    # Given
+    hass = MagicMock()
+    hass.data = {}
+
+    # When / Then
+    assert async_get_token_cache(hass) is async_get_token_cache(hass)
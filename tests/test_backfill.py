@@ -0,0 +1,236 @@
+"""Unit tests for the statistics backfill."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.mylight_systems.api.exceptions import CommunicationError
+from custom_components.mylight_systems.api.models import MeasureSeries, MeasureSeriesWindow
+from custom_components.mylight_systems.backfill import (
+    async_backfill_statistics,
+    async_schedule_backfill,
+    series_to_statistics,
+    statistic_id,
+)
+
+NOW = datetime(2026, 3, 10, 12, tzinfo=UTC)
+
+
+def _series(day: date, produced: list[float | None]) -> MeasureSeries:
+    """Create an hourly series of produced energy in Ws starting at midnight of day."""
+    return MeasureSeries(
+        "hour",
+        timestamps=[datetime(day.year, day.month, day.day, hour) for hour in range(len(produced))],
+        values={"produced_energy": produced},
+        units={"produced_energy": "Ws"},
+    )
+
+
+def _make_entry(windows, error: Exception | None = None) -> MagicMock:
+    """Create a mock config entry whose client yields the given windows, then raises error."""
+
+    async def _iter(*args, **kwargs):
+        for window in windows:
+            yield window
+        if error is not None:
+            raise error
+
+    entry = MagicMock()
+    entry.entry_id = "01ABCDEF"
+    entry.title = "MyLight"
+    entry.data = {"email": "test@example.com", "password": "secret", "grid_type": "one_phase", "virtual_device_id": "d"}
+    coordinator = entry.runtime_data
+    coordinator.authenticate_user = AsyncMock()
+    coordinator.auth_token = "token"  # noqa: S105
+    coordinator.client.async_iter_measures_series = MagicMock(side_effect=_iter)
+    coordinator.history = None
+    return entry
+
+
+@pytest.fixture
+def mock_store():
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=None)
+    store.async_save = AsyncMock()
+    with patch("custom_components.mylight_systems.backfill.backfill_store", return_value=store):
+        yield store
+
+
+@pytest.fixture
+def mock_add_statistics():
+    with (
+        patch("custom_components.mylight_systems.backfill.async_add_external_statistics") as add_statistics,
+        patch.object(dt_util, "now", return_value=NOW),
+    ):
+        yield add_statistics
+
+
+def test_series_to_statistics__should_convert_to_wh_and_continue_sums():
+    # Given
+    sums = {"total_solar_production": 100.0}
+
+    # When
+    rows = series_to_statistics(_series(date(2026, 3, 1), [3600.0, None, 7200.0]), sums)
+
+    # Then
+    assert [row["sum"] for row in rows["total_solar_production"]] == [101.0, 103.0]
+    assert rows["total_solar_production"][1]["start"].hour == 2
+    assert rows["total_solar_production"][0]["start"].tzinfo is not None
+    assert "total_grid_consumption" not in rows
+    assert sums["total_solar_production"] == 103.0
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_import_history_and_save_checkpoint(mock_store, mock_add_statistics):
+    # Given
+    windows = [
+        MeasureSeriesWindow(date(2026, 2, 8), date(2026, 2, 15), _series(date(2026, 2, 8), [3600.0])),
+        MeasureSeriesWindow(date(2026, 2, 15), date(2026, 2, 22), _series(date(2026, 2, 15), [7200.0])),
+    ]
+    entry = _make_entry(windows)
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    args = entry.runtime_data.client.async_iter_measures_series.call_args.args
+    assert args[3:5] == ("2026-02-08", "2026-03-10")
+    metadata, rows = mock_add_statistics.call_args.args[1:]
+    assert metadata["statistic_id"] == statistic_id("01ABCDEF", "total_solar_production")
+    assert metadata["statistic_id"] == "mylight_systems:01abcdef_total_solar_production"
+    assert metadata["unit_class"] == "energy"
+    assert [row["sum"] for row in rows] == [1.0, 3.0]
+    mock_store.async_save.assert_awaited_once_with({"cursor": "2026-02-22", "sums": {"total_solar_production": 3.0}})
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_resume_from_checkpoint(mock_store, mock_add_statistics):
+    # Given
+    mock_store.async_load.return_value = {"cursor": "2026-03-09", "sums": {"total_solar_production": 10.0}}
+    entry = _make_entry([MeasureSeriesWindow(date(2026, 3, 9), date(2026, 3, 10), _series(date(2026, 3, 9), [3600.0]))])
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    assert entry.runtime_data.client.async_iter_measures_series.call_args.args[3] == "2026-03-09"
+    assert mock_add_statistics.call_args.args[2][0]["sum"] == 11.0
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_skip_when_up_to_date(mock_store, mock_add_statistics):
+    # Given
+    mock_store.async_load.return_value = {"cursor": "2026-03-10", "sums": {}}
+    entry = _make_entry([])
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    entry.runtime_data.client.async_iter_measures_series.assert_not_called()
+    mock_store.async_save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_keep_completed_windows_when_interrupted(mock_store, mock_add_statistics):
+    # Given
+    entry = _make_entry(
+        [MeasureSeriesWindow(date(2026, 2, 8), date(2026, 2, 15), _series(date(2026, 2, 8), [3600.0]))],
+        error=CommunicationError(),
+    )
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    mock_add_statistics.assert_called_once()
+    assert mock_store.async_save.await_args.args[0]["cursor"] == "2026-02-15"
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_read_windows_already_stored_locally(mock_store, mock_add_statistics):
+    # Given
+    mock_store.async_load.return_value = {"cursor": "2026-02-24", "sums": {}}
+    entry = _make_entry([MeasureSeriesWindow(date(2026, 3, 3), date(2026, 3, 10), _series(date(2026, 3, 3), [7200.0]))])
+    stored_start = dt_util.start_of_local_day(date(2026, 2, 24))
+    stored = MeasureSeries(
+        "hour",
+        timestamps=[stored_start + timedelta(hours=hour) for hour in range(7 * 24)],
+        values={"produced_energy": [3600.0] + [None] * (7 * 24 - 1)},
+    )
+    history = entry.runtime_data.history = MagicMock()
+    history.async_get_series = AsyncMock(side_effect=[stored, MeasureSeries("hour")])
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    assert entry.runtime_data.client.async_iter_measures_series.call_args.args[3:5] == ("2026-03-03", "2026-03-10")
+    assert [row["sum"] for row in mock_add_statistics.call_args.args[2]] == [1.0, 3.0]
+    history.async_add_series.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_backfill__should_stop_before_fetching_when_the_token_was_dropped(mock_store, mock_add_statistics):
+    # Given
+    mock_store.async_load.return_value = {"cursor": "2026-02-24", "sums": {}}
+    entry = _make_entry([MeasureSeriesWindow(date(2026, 3, 3), date(2026, 3, 10), _series(date(2026, 3, 3), [7200.0]))])
+    stored_start = dt_util.start_of_local_day(date(2026, 2, 24))
+    stored = MeasureSeries(
+        "hour",
+        timestamps=[stored_start + timedelta(hours=hour) for hour in range(7 * 24)],
+        values={"produced_energy": [3600.0] + [None] * (7 * 24 - 1)},
+    )
+
+    async def _get_series(*args):
+        if args[2] == stored_start:
+            return stored
+        entry.runtime_data.auth_token = None
+        return MeasureSeries("hour")
+
+    entry.runtime_data.history = MagicMock()
+    entry.runtime_data.history.async_get_series = AsyncMock(side_effect=_get_series)
+
+    # When
+    await async_backfill_statistics(MagicMock(), entry)
+
+    # Then
+    entry.runtime_data.client.async_iter_measures_series.assert_not_called()
+    assert mock_store.async_save.await_args.args[0]["cursor"] == "2026-03-03"
+
+
+def test_schedule_backfill__should_run_after_the_first_refresh_and_nightly_without_overlapping_runs():
+    # Given
+    hass = MagicMock()
+    entry = _make_entry([])
+    entry.runtime_data.phase_fraction = 0.5
+    running = MagicMock()
+    running.done.return_value = False
+    entry.async_create_background_task.side_effect = lambda hass, coro, name: coro.close() or running
+
+    # When
+    with (
+        patch("custom_components.mylight_systems.backfill.async_call_later") as call_later,
+        patch("custom_components.mylight_systems.backfill.async_track_time_change") as track_time_change,
+    ):
+        unsub = async_schedule_backfill(hass, entry)
+        started_on_setup = entry.async_create_background_task.call_count
+        first = call_later.call_args.args[2]
+        nightly = track_time_change.call_args.args[1]
+        first(NOW)
+        nightly(NOW)
+        running.done.return_value = True
+        nightly(NOW)
+        unsub()
+
+    # Then
+    assert started_on_setup == 0
+    assert call_later.call_args.args[1] == 120
+    assert track_time_change.call_args.kwargs == {"hour": 1, "minute": 30, "second": 0}
+    assert entry.async_create_background_task.call_count == 2
+    call_later.return_value.assert_called_once()
+    track_time_change.return_value.assert_called_once()
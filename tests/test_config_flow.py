@@ -62,6 +62,7 @@ def make_handler(context: dict | None = None) -> MyLightSystemsFlowHandler:
     """Instantiate a flow handler with the minimum HA attributes mocked."""
     handler = MyLightSystemsFlowHandler()
     handler.hass = MagicMock()
+    handler.hass.data = {}
     handler.flow_id = "test_flow"
     handler.handler = DOMAIN
     handler.context = context or {}  # ty: ignore[invalid-assignment]
@@ -115,7 +116,7 @@ async def test_user_step__creates_entry_on_valid_credentials():
     handler._abort_if_unique_id_configured = MagicMock()  # ty: ignore[invalid-assignment]
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(),
@@ -141,7 +142,7 @@ async def test_user_step__shows_auth_error_on_invalid_credentials():
     handler = make_handler()
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=InvalidCredentialsError()),
@@ -159,7 +160,7 @@ async def test_user_step__shows_connection_error_on_communication_failure():
     handler = make_handler()
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=CommunicationError()),
@@ -177,7 +178,7 @@ async def test_user_step__shows_unknown_error_on_unexpected_api_error():
     handler = make_handler()
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=MyLightSystemsError("boom")),
@@ -216,7 +217,7 @@ async def test_reauth_confirm__updates_entry_on_valid_new_password():
     )
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(),
@@ -235,7 +236,7 @@ async def test_reauth_confirm__shows_auth_error_on_invalid_credentials():
     handler.hass.config_entries.async_get_entry.return_value = make_mock_entry()  # ty: ignore[unresolved-attribute]
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=InvalidCredentialsError()),
@@ -254,7 +255,7 @@ async def test_reauth_confirm__shows_connection_error_on_communication_failure()
     handler.hass.config_entries.async_get_entry.return_value = make_mock_entry()  # ty: ignore[unresolved-attribute]
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=CommunicationError()),
@@ -305,7 +306,7 @@ async def test_reconfigure__updates_password_on_valid_input():
     )
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(),
@@ -324,7 +325,7 @@ async def test_reconfigure__shows_auth_error_on_invalid_credentials():
     handler.hass.config_entries.async_get_entry.return_value = make_mock_entry()  # ty: ignore[unresolved-attribute]
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=InvalidCredentialsError()),
@@ -343,7 +344,7 @@ async def test_reconfigure__shows_connection_error_on_communication_failure():
     handler.hass.config_entries.async_get_entry.return_value = make_mock_entry()  # ty: ignore[unresolved-attribute]
 
     with (
-        patch("custom_components.mylight_systems.config_flow.async_create_clientsession"),
+        patch("custom_components.mylight_systems.config_flow.async_borrow_session"),
         patch(
             "custom_components.mylight_systems.config_flow.MyLightApiClient",
             return_value=make_mock_client(login_exc=CommunicationError()),
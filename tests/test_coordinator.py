@@ -0,0 +1,725 @@
+"""Unit tests for the data update coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.mylight_systems.api.exceptions import (
+    CircuitOpenError,
+    CommunicationError,
+    InvalidCredentialsError,
+    UnauthorizedError,
+)
+from custom_components.mylight_systems.api.models import DeviceStates, Login, Measure
+from custom_components.mylight_systems.auth import CachedToken
+from custom_components.mylight_systems.coordinator import MyLightSystemsDataUpdateCoordinator
+
+ENTRY_DATA = {
+    "email": "test@example.com",
+    "password": "secret",
+    "grid_type": "one_phase",
+    "virtual_device_id": "vrt-123456",
+    "virtual_battery_id": "bat-123456",
+    "master_relay_id": "sw-123",
+}
+
+
+def _make_mock_client() -> MagicMock:
+    """Create a mock API client returning a valid payload for every endpoint."""
+    client = MagicMock()
+    client.base_url = "https://myhome.mylight-systems.com"
+    client.async_login = AsyncMock(side_effect=[Login(auth_token="token-1"), Login(auth_token="token-2")])  # noqa: S106
+    client.async_get_measures_grouping = AsyncMock(return_value=[Measure("produced_energy", 1200.0, "Ws")])
+    client.async_get_measures_total = AsyncMock(return_value=[Measure("autonomy_rate", 42.0, "%")])
+    client.async_get_states = AsyncMock(return_value=DeviceStates(devices={"sw-123": "on"}))
+    client.async_turn_on = AsyncMock()
+    return client
+
+
+def _make_coordinator(client: MagicMock) -> MyLightSystemsDataUpdateCoordinator:
+    """Create a coordinator around a mock client and config entry."""
+    entry = MagicMock()
+    entry.data = ENTRY_DATA
+    entry.options = {}
+    entry.title = "MyLight"
+    entry.entry_id = "entry-1"
+    hass = MagicMock()
+    hass.data = {}
+    return MyLightSystemsDataUpdateCoordinator(hass, client, entry)
+
+
+@pytest.fixture(autouse=True)
+def mock_issue_registry():
+    with patch("custom_components.mylight_systems.coordinator.ir") as ir:
+        yield ir
+
+
+@pytest.fixture(autouse=True)
+def mock_token_store():
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=None)
+    store.async_save = AsyncMock()
+    with patch("custom_components.mylight_systems.coordinator.token_store", return_value=store):
+        yield store
+
+
+@pytest.fixture(autouse=True)
+def mock_snapshot_store():
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=None)
+    store.async_save = AsyncMock()
+    with patch("custom_components.mylight_systems.coordinator.snapshot_store", return_value=store):
+        yield store
+
+
+@pytest.mark.asyncio
+async def test_update__should_relogin_once_and_replay_only_rejected_requests():
+    # Given
+    client = _make_mock_client()
+    client.async_get_measures_total.side_effect = [UnauthorizedError(), [Measure("autonomy_rate", 42.0, "%")]]
+    coordinator = _make_coordinator(client)
+
+    # When
+    data = await coordinator._async_update_data()
+
+    # Then
+    assert client.async_login.await_count == 2
+    assert client.async_get_measures_grouping.await_count == 1
+    assert client.async_get_states.await_count == 1
+    assert client.async_get_measures_total.await_args_list[1].args[0] == "token-2"
+    assert coordinator.auth_token == "token-2"  # noqa: S105
+    assert data.autonomy_rate is not None
+    assert data.autonomy_rate.value == 42.0
+
+
+@pytest.mark.asyncio
+async def test_update__should_relogin_once_when_several_requests_are_rejected():
+    # Given
+    client = _make_mock_client()
+    client.async_get_measures_total.side_effect = [UnauthorizedError(), [Measure("autonomy_rate", 42.0, "%")]]
+    client.async_get_states.side_effect = [UnauthorizedError(), DeviceStates(devices={"sw-123": "on"})]
+    coordinator = _make_coordinator(client)
+
+    # When
+    data = await coordinator._async_update_data()
+
+    # Then
+    assert client.async_login.await_count == 2
+    assert client.async_get_measures_grouping.await_count == 1
+    assert data.master_relay_state == "on"
+
+
+@pytest.mark.asyncio
+async def test_update__should_request_reauth_when_relogin_is_rejected(mock_issue_registry):
+    # Given
+    client = _make_mock_client()
+    client.async_login.side_effect = [Login(auth_token="token-1"), InvalidCredentialsError()]  # noqa: S106
+    client.async_get_states.side_effect = UnauthorizedError()
+    coordinator = _make_coordinator(client)
+
+    # When / Then
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+    mock_issue_registry.async_create_issue.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update__should_fail_cycle_without_reauth_when_replay_is_rejected(mock_issue_registry):
+    # Given
+    client = _make_mock_client()
+    client.async_get_states.side_effect = UnauthorizedError()
+    coordinator = _make_coordinator(client)
+
+    # When / Then
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert client.async_login.await_count == 2
+    mock_issue_registry.async_create_issue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_turn_on_master_relay__should_replay_command_after_relogin():
+    # Given
+    client = _make_mock_client()
+    client.async_turn_on.side_effect = [UnauthorizedError(), None]
+    coordinator = _make_coordinator(client)
+    await coordinator.authenticate_user("test@example.com", "secret")
+
+    # When
+    await coordinator.turn_on_master_relay()
+
+    # Then
+    assert [call.args for call in client.async_turn_on.await_args_list] == [
+        ("token-1", "sw-123"),
+        ("token-2", "sw-123"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_turn_on_master_relay__should_wait_for_a_relogin_in_progress():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    await coordinator.authenticate_user("test@example.com", "secret")
+    login_started, release_login = asyncio.Event(), asyncio.Event()
+
+    async def slow_login(*_args: object) -> Login:
+        login_started.set()
+        await release_login.wait()
+        return Login(auth_token="token-2")  # noqa: S106
+
+    async def turn_on(token: str, _relay_id: str) -> None:
+        if token == "token-1":  # noqa: S105
+            raise UnauthorizedError()
+
+    client.async_login.side_effect = slow_login
+    client.async_get_states.side_effect = [UnauthorizedError(), DeviceStates(devices={"sw-123": "on"})]
+    client.async_turn_on.side_effect = turn_on
+    refresh = asyncio.ensure_future(
+        coordinator._async_call_with_reauth(lambda token: client.async_get_states(token, use_cache=False))
+    )
+    await login_started.wait()
+
+    # When
+    command = asyncio.ensure_future(coordinator.turn_on_master_relay())
+    await asyncio.sleep(0)
+    release_login.set()
+    await asyncio.gather(refresh, command)
+
+    # Then
+    assert client.async_login.await_count == 2
+    assert client.async_turn_on.await_args_list[-1].args == ("token-2", "sw-123")
+
+
+@pytest.mark.asyncio
+async def test_login__should_schedule_background_refresh_before_token_expiry():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later") as call_later:
+        await coordinator.authenticate_user("test@example.com", "secret")
+
+    # Then
+    delay = call_later.call_args.args[1]
+    assert 7200 * 0.8 - 120 <= delay <= 7200 * 0.8
+    assert coordinator.auth_metrics["logins"] == 1
+    assert coordinator.auth_metrics["last_login_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_background_refresh__should_renew_token_without_an_update_cycle():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator.authenticate_user("test@example.com", "secret")
+
+        # When
+        await coordinator._async_refresh_token()
+
+    # Then
+    assert coordinator.auth_token == "token-2"  # noqa: S105
+    assert coordinator.auth_metrics["background_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh__should_keep_token_and_retry_when_login_fails():
+    # Given
+    client = _make_mock_client()
+    client.async_login.side_effect = [Login(auth_token="token-1"), CommunicationError()]  # noqa: S106
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later") as call_later:
+        await coordinator.authenticate_user("test@example.com", "secret")
+
+        # When
+        await coordinator._async_refresh_token()
+
+    # Then
+    assert coordinator.auth_token == "token-1"  # noqa: S105
+    assert coordinator.auth_metrics["login_failures"] == 1
+    assert call_later.call_args.args[1] == 60
+
+
+@pytest.mark.asyncio
+async def test_login__should_persist_token_and_expiry(mock_token_store):
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator.authenticate_user("test@example.com", "secret")
+
+    # Then
+    stored = mock_token_store.async_save.await_args.args[0]
+    assert stored["email"] == "test@example.com"
+    assert stored["auth_token"] == "token-1"  # noqa: S105
+    assert stored["expires_at"] == coordinator.auth_metrics["token_expires_at"]
+
+
+@pytest.mark.asyncio
+async def test_restore_token__should_skip_login_while_stored_token_is_valid(mock_token_store):
+    # Given
+    expires_at = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+    mock_token_store.async_load.return_value = {
+        "email": "test@example.com",
+        "auth_token": "stored-token",
+        "expires_at": expires_at,
+    }
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator.async_restore_token()
+        await coordinator._async_update_data()
+
+    # Then
+    client.async_login.assert_not_awaited()
+    assert client.async_get_states.await_args.args[0] == "stored-token"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("email", "expires_in"),
+    [("test@example.com", timedelta(seconds=-1)), ("other@example.com", timedelta(hours=1))],
+)
+async def test_restore_token__should_login_when_stored_token_is_expired_or_foreign(mock_token_store, email, expires_in):
+    # Given
+    mock_token_store.async_load.return_value = {
+        "email": email,
+        "auth_token": "stored-token",
+        "expires_at": (datetime.now(UTC) + expires_in).isoformat(),
+    }
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator.async_restore_token()
+        await coordinator._async_update_data()
+
+    # Then
+    client.async_login.assert_awaited_once()
+    assert coordinator.auth_token == "token-1"  # noqa: S105
+
+
+@pytest.mark.asyncio
+async def test_restore_token__should_login_again_when_stored_token_was_revoked(mock_token_store):
+    # Given
+    mock_token_store.async_load.return_value = {
+        "email": "test@example.com",
+        "auth_token": "stored-token",
+        "expires_at": (datetime.now(UTC) + timedelta(hours=1)).isoformat(),
+    }
+    client = _make_mock_client()
+    client.async_get_states.side_effect = [UnauthorizedError(), DeviceStates(devices={"sw-123": "on"})]
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator.async_restore_token()
+        data = await coordinator._async_update_data()
+
+    # Then
+    client.async_login.assert_awaited_once()
+    assert data.master_relay_state == "on"
+
+
+@pytest.mark.asyncio
+async def test_update__should_reuse_token_obtained_by_the_config_flow():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    coordinator._token_cache.set(
+        client.base_url, "test@example.com", CachedToken("flow-token", datetime.now(UTC) + timedelta(hours=2))
+    )
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+
+    # Then
+    client.async_login.assert_not_awaited()
+    assert client.async_get_states.await_args.args[0] == "flow-token"
+
+
+@pytest.mark.asyncio
+async def test_update__should_not_refetch_energy_before_its_interval_elapsed():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+
+        # When
+        coordinator._refresh_groups["states"].invalidate()
+        await coordinator._async_update_data()
+
+    # Then
+    assert coordinator.update_interval is not None
+    assert timedelta(minutes=1) < coordinator.update_interval < timedelta(minutes=4)
+    assert client.async_get_states.await_count == 2
+    assert client.async_get_measures_grouping.await_count == 1
+    assert client.async_get_measures_total.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update__should_keep_previous_energy_when_only_energy_fails():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+        client.async_get_measures_grouping.side_effect = CommunicationError()
+        client.async_get_states.return_value = DeviceStates(devices={"sw-123": "off"})
+        for group in coordinator._refresh_groups.values():
+            group.invalidate()
+
+        # When
+        data = await coordinator._async_update_data()
+
+    # Then
+    assert data.produced_energy is not None
+    assert data.produced_energy.value == 1200.0
+    assert data.master_relay_state == "off"
+    assert coordinator.refresh_group_metrics["energy"]["consecutive_failures"] == 1
+    assert coordinator.refresh_group_metrics["states"]["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_update__should_keep_previous_states_when_only_states_are_due_and_fail(caplog):
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+        first_success = coordinator._refresh_groups["states"].last_success
+        client.async_get_states.side_effect = CommunicationError()
+        coordinator._refresh_groups["states"].invalidate()
+
+        # When
+        data = await coordinator._async_update_data()
+
+    # Then
+    assert data.master_relay_state == "on"
+    assert coordinator.stale_since(frozenset({"master_relay_state"})) == first_success
+    assert coordinator.stale_since(frozenset({"produced_energy"})) is None
+    assert "Refresh of states data failed, keeping the previous values: A communication error occurred" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_update__should_fail_when_the_circuit_breaker_is_open():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+        client.async_get_states.side_effect = CircuitOpenError(30)
+        coordinator._refresh_groups["states"].invalidate()
+
+        # When / Then
+        with pytest.raises(UpdateFailed, match="circuit breaker open"):
+            await coordinator._async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_update__should_keep_completed_groups_when_another_group_misses_the_deadline():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with (
+        patch("custom_components.mylight_systems.coordinator.async_call_later"),
+        patch("custom_components.mylight_systems.coordinator.UPDATE_CYCLE_DEADLINE_IN_SECONDS", 0.05),
+    ):
+        await coordinator._async_update_data()
+
+        async def hang(*_args: object, **_kwargs: object) -> None:
+            await asyncio.Event().wait()
+
+        client.async_get_states.side_effect = hang
+        client.async_get_measures_grouping.return_value = [Measure("produced_energy", 1500.0, "Ws")]
+        for group in coordinator._refresh_groups.values():
+            group.invalidate()
+
+        # When
+        data = await coordinator._async_update_data()
+
+    # Then
+    assert data.produced_energy is not None
+    assert data.produced_energy.value == 1500.0
+    assert data.master_relay_state == "on"
+    assert coordinator.refresh_group_metrics["states"]["consecutive_failures"] == 1
+    assert coordinator.refresh_group_metrics["energy"]["consecutive_failures"] == 0
+    assert coordinator.stale_since(frozenset({"master_relay_state"})) is not None
+
+
+@pytest.mark.asyncio
+async def test_update__should_keep_previous_states_when_the_only_due_group_hangs():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with (
+        patch("custom_components.mylight_systems.coordinator.async_call_later"),
+        patch("custom_components.mylight_systems.coordinator.UPDATE_CYCLE_DEADLINE_IN_SECONDS", 0.05),
+    ):
+        await coordinator._async_update_data()
+        first_success = coordinator._refresh_groups["states"].last_success
+
+        async def hang(*_args: object, **_kwargs: object) -> None:
+            await asyncio.Event().wait()
+
+        client.async_get_states.side_effect = hang
+        coordinator._refresh_groups["states"].invalidate()
+
+        # When
+        data = await coordinator._async_update_data()
+
+    # Then
+    assert data.master_relay_state == "on"
+    assert coordinator.stale_since(frozenset({"master_relay_state"})) == first_success
+    assert coordinator.refresh_group_metrics["states"]["last_error"] == (
+        "Refresh of states data did not complete within 0.05 seconds"
+    )
+
+
+@pytest.mark.asyncio
+async def test_update__should_keep_previous_values_when_the_login_hangs():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with (
+        patch("custom_components.mylight_systems.coordinator.async_call_later"),
+        patch("custom_components.mylight_systems.coordinator.UPDATE_CYCLE_DEADLINE_IN_SECONDS", 0.05),
+    ):
+        await coordinator._async_update_data()
+
+        async def hang(*_args: object, **_kwargs: object) -> None:
+            await asyncio.Event().wait()
+
+        coordinator._refresh_groups["states"].invalidate()
+
+        # When
+        with patch.object(coordinator, "authenticate_user", side_effect=hang):
+            data = await coordinator._async_update_data()
+
+    # Then
+    assert data.master_relay_state == "on"
+    assert client.async_get_states.await_count == 1
+    assert coordinator.refresh_group_metrics["states"]["consecutive_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_update__should_fail_when_a_group_without_data_fails():
+    # Given
+    client = _make_mock_client()
+    client.async_get_measures_grouping.side_effect = CommunicationError()
+    coordinator = _make_coordinator(client)
+
+    # When / Then
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"), pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_turn_on_master_relay__should_make_states_due():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+
+        # When
+        await coordinator.turn_on_master_relay()
+        await coordinator._async_update_data()
+
+    # Then
+    assert client.async_get_states.await_count == 2
+    assert client.async_get_measures_grouping.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update__should_skip_requests_when_no_report_is_expected():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        first = await coordinator._async_update_data()
+
+        # When
+        second = await coordinator._async_update_data()
+
+    # Then
+    assert second == first
+    assert client.async_login.await_count == 1
+    assert client.async_get_states.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update__should_report_only_the_fields_that_changed():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+        client.async_get_states.return_value = DeviceStates(devices={"sw-123": "off"})
+        for group in coordinator._refresh_groups.values():
+            group.invalidate()
+
+        # When
+        await coordinator._async_update_data()
+
+    # Then
+    assert coordinator.data_changed(frozenset({"master_relay_state"}))
+    assert not coordinator.data_changed(frozenset({"produced_energy", "autonomy_rate"}))
+    assert coordinator.state_write_metrics["changed_fields"] == ["master_relay_state"]
+
+
+@pytest.mark.asyncio
+async def test_update__should_save_snapshot_when_data_changed(mock_snapshot_store):
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+
+    # Then
+    snapshot = mock_snapshot_store.async_delay_save.call_args.args[0]()
+    assert snapshot["data"]["produced_energy"] == {"type": "produced_energy", "value": 1200.0, "unit": "Ws"}
+    assert snapshot["data"]["master_relay_state"] == "on"
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot__should_serve_data_saved_today(mock_snapshot_store):
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+    mock_snapshot_store.async_load.return_value = mock_snapshot_store.async_delay_save.call_args.args[0]()
+    restored = _make_coordinator(client)
+
+    # When
+    result = await restored.async_restore_snapshot()
+
+    # Then
+    assert result is True
+    assert restored.data == coordinator._data
+    assert restored.master_relay_is_on()
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot__should_ignore_snapshot_from_a_previous_day(mock_snapshot_store):
+    # Given
+    mock_snapshot_store.async_load.return_value = {
+        "saved_at": (datetime.now(UTC) - timedelta(days=2)).isoformat(),
+        "data": {"master_relay_state": "on"},
+    }
+    coordinator = _make_coordinator(_make_mock_client())
+
+    # When
+    result = await coordinator.async_restore_snapshot()
+
+    # Then
+    assert result is False
+    assert coordinator.data is None
+
+
+@pytest.mark.asyncio
+async def test_staggered_refresh__should_wait_for_the_entry_delay():
+    # Given
+    coordinator = _make_coordinator(_make_mock_client())
+
+    # When
+    with (
+        patch.object(coordinator, "async_refresh") as refresh,
+        patch("custom_components.mylight_systems.coordinator.asyncio.sleep") as sleep,
+    ):
+        await coordinator.async_staggered_refresh()
+
+    # Then
+    sleep.assert_awaited_once_with(60 * coordinator.phase_fraction)
+    refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update__should_carry_forward_failed_fields_as_stale_and_retry_only_them():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+        first_success = coordinator._refresh_groups["totals"].last_success
+        client.async_get_measures_total.side_effect = CommunicationError()
+        for group in coordinator._refresh_groups.values():
+            group.invalidate()
+
+        # When
+        data = await coordinator._async_update_data()
+
+    # Then
+    totals = coordinator._refresh_groups["totals"]
+    assert data.autonomy_rate is not None
+    assert data.autonomy_rate.value == 42.0
+    assert coordinator.stale_since(frozenset({"autonomy_rate"})) == first_success
+    assert coordinator.stale_since(frozenset({"produced_energy"})) is None
+    assert coordinator.data_changed(frozenset({"self_conso"}))
+    assert totals.last_attempt is not None
+    assert totals.next_due() == totals.last_attempt + timedelta(minutes=2)
+    energy_due, totals_due = coordinator._refresh_groups["energy"].next_due(), totals.next_due()
+    assert energy_due is not None
+    assert totals_due is not None
+    assert energy_due > totals_due
+
+
+@pytest.mark.asyncio
+async def test_update__should_stretch_update_interval_while_the_api_keeps_failing():
+    # Given
+    client = _make_mock_client()
+    client.async_get_states.side_effect = CommunicationError()
+    client.async_get_measures_grouping.side_effect = CommunicationError()
+    client.async_get_measures_total.side_effect = CommunicationError()
+    coordinator = _make_coordinator(client)
+
+    # When
+    intervals = []
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        for _ in range(3):
+            for group in coordinator._refresh_groups.values():
+                group.invalidate()
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+            intervals.append(coordinator.update_interval)
+
+    # Then
+    assert [round(interval.total_seconds() / 60) for interval in intervals] == [2, 4, 8]
+    assert coordinator.update_interval_metrics == {
+        "effective_seconds": intervals[-1].total_seconds(),
+        "backing_off": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_update__should_bypass_the_response_cache():
+    # Given
+    client = _make_mock_client()
+    coordinator = _make_coordinator(client)
+
+    # When
+    with patch("custom_components.mylight_systems.coordinator.async_call_later"):
+        await coordinator._async_update_data()
+
+    # Then
+    assert client.async_get_states.await_args.kwargs == {"use_cache": False}
+    assert client.async_get_measures_grouping.await_args.kwargs["use_cache"] is False
+    assert client.async_get_measures_total.await_args.kwargs == {"use_cache": False}
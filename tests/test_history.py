@@ -0,0 +1,110 @@
+"""Unit tests for the local measure history."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from homeassistant.util import dt as dt_util
+
+from custom_components.mylight_systems.api.models import Measure, MeasureSeries
+from custom_components.mylight_systems.history import MeasureHistory
+
+
+@pytest.fixture
+def hass():
+    """Create a mock hass running executor jobs inline."""
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target, *args: target(*args))
+    return hass
+
+
+@pytest.fixture
+def mock_call_later():
+    with patch("custom_components.mylight_systems.history.async_call_later") as call_later:
+        yield call_later
+
+
+@pytest_asyncio.fixture
+async def history(hass, tmp_path, mock_call_later):
+    """Create a history database in a temporary directory."""
+    history = MeasureHistory(hass, str(tmp_path / "history.db"), retention_days=30)
+    await history.async_setup()
+    yield history
+    await history.async_close()
+
+
+def _series(start: datetime) -> MeasureSeries:
+    """Create an hourly series of three groups."""
+    return MeasureSeries(
+        "hour",
+        timestamps=[start + timedelta(hours=hour) for hour in range(3)],
+        values={"produced_energy": [1.0, None, 3.0], "grid_energy": [4.0, 5.0, 6.0]},
+        units={"produced_energy": "Ws", "grid_energy": "Ws"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_history__should_return_range_of_stored_series(history):
+    # Given
+    start = dt_util.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+    history.async_add_series("device", _series(start))
+
+    # When
+    series = await history.async_get_series("device", "hour", start + timedelta(hours=1), start + timedelta(hours=3))
+
+    # Then
+    assert series.timestamps == [start + timedelta(hours=1), start + timedelta(hours=2)]
+    assert series.column("produced_energy") == [None, 3.0]
+    assert series.column("grid_energy") == [5.0, 6.0]
+    assert series.units["grid_energy"] == "Ws"
+
+
+@pytest.mark.asyncio
+async def test_history__should_keep_one_value_per_key(history):
+    # Given
+    period = dt_util.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    history.async_add_measures("device", "day", period, [Measure("produced_energy", 1.0, "Ws")])
+    history.async_add_measures("device", "day", period, [Measure("produced_energy", 2.0, "Ws")])
+
+    # When
+    series = await history.async_get_series("device", "day", period, period + timedelta(days=1))
+
+    # Then
+    assert series.column("produced_energy") == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_history__should_batch_writes_until_flushed(history, tmp_path, mock_call_later):
+    # Given
+    period = dt_util.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # When
+    history.async_add_measures("device", "day", period, [Measure("produced_energy", 1.0, "Ws")])
+
+    # Then
+    mock_call_later.assert_called_once()
+    with sqlite3.connect(tmp_path / "history.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM measures").fetchone() == (0,)
+    await history.async_flush()
+    with sqlite3.connect(tmp_path / "history.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM measures").fetchone() == (1,)
+
+
+@pytest.mark.asyncio
+async def test_history__should_purge_measures_older_than_retention(history):
+    # Given
+    old = dt_util.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=60)
+    recent = dt_util.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+    history.async_add_series("device", _series(old))
+    history.async_add_series("device", _series(recent))
+
+    # When
+    await history.async_flush()
+    series = await history.async_get_series("device", "hour", old, recent + timedelta(days=1))
+
+    # Then
+    assert series.timestamps[0] == recent
@@ -0,0 +1,159 @@
+"""Unit tests for the refresh groups."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+from custom_components.mylight_systems.refresh import RefreshGroup, ReportPhase, phase_fraction
+
+START = datetime(2025, 6, 1, 12, 0, tzinfo=UTC)
+PERIOD = timedelta(minutes=5)
+
+
+def _make_group(interval: timedelta = timedelta(minutes=2)) -> RefreshGroup:
+    """Create a group reporting every five minutes."""
+    return RefreshGroup("states", interval, AsyncMock(), ReportPhase(PERIOD))
+
+
+def test_report_phase__should_narrow_window_with_each_observed_change():
+    # Given
+    phase = ReportPhase(PERIOD)
+
+    # When
+    phase.observe(START, START + timedelta(minutes=2), changed=True)
+    phase.observe(START + timedelta(minutes=6), START + timedelta(minutes=8), changed=True)
+
+    # Then
+    assert phase.window == (START + timedelta(minutes=6), START + timedelta(minutes=7))
+
+
+def test_report_phase__should_move_window_later_after_an_early_unchanged_poll():
+    # Given
+    phase = ReportPhase(PERIOD)
+    phase.observe(START, START + timedelta(minutes=2), changed=True)
+
+    # When
+    phase.observe(START + timedelta(minutes=4), START + timedelta(minutes=6), changed=False)
+
+    # Then
+    assert phase.window == (START + timedelta(minutes=1), START + timedelta(minutes=2))
+
+
+def test_report_phase__should_return_next_report_after_a_time():
+    # Given
+    phase = ReportPhase(PERIOD)
+    phase.observe(START, START + timedelta(minutes=2), changed=True)
+
+    # When
+    report = phase.next_report(START + timedelta(minutes=3))
+
+    # Then
+    assert report == START + timedelta(minutes=7)
+
+
+def test_refresh_group__should_be_due_without_data():
+    # Given
+    group = _make_group()
+
+    # When / Then
+    assert group.is_due(START)
+
+
+def test_refresh_group__should_poll_just_after_the_expected_report():
+    # Given
+    group = _make_group()
+    group.record_success(START, "a")
+    group.record_success(START + timedelta(minutes=2), "b")
+
+    # When
+    due = group.next_due()
+
+    # Then
+    assert due is not None
+    assert due == START + timedelta(minutes=7, seconds=10)
+    assert not group.is_due(START + timedelta(minutes=4))
+    assert group.is_due(due)
+
+
+def test_refresh_group__should_count_unchanged_polls():
+    # Given
+    group = _make_group()
+    group.record_success(START, "a")
+
+    # When
+    group.record_success(START + timedelta(minutes=2), "a")
+
+    # Then
+    assert group.unchanged_polls == 1
+    assert group.phase is not None
+    assert group.phase.window is None
+
+
+def test_refresh_group__should_retry_failed_group_after_its_interval():
+    # Given
+    group = _make_group()
+    group.record_success(START, "a")
+    group.record_success(START + timedelta(minutes=2), "b")
+
+    # When
+    group.record_failure(START + timedelta(minutes=8), RuntimeError("boom"))
+
+    # Then
+    assert group.next_due() == START + timedelta(minutes=10)
+    assert group.metrics["last_error"] == "boom"
+
+
+def test_refresh_group__should_keep_to_its_offset_slots():
+    # Given
+    group = RefreshGroup("energy", timedelta(minutes=15), AsyncMock(), offset=timedelta(minutes=4))
+
+    # When
+    group.record_success(START + timedelta(minutes=1), "a")
+
+    # Then
+    assert group.next_due() == START + timedelta(minutes=19)
+
+
+def test_phase_fraction__should_be_stable_and_spread_across_entries():
+    # Given
+    entry_ids = [f"entry-{index}" for index in range(100)]
+
+    # When
+    fractions = [phase_fraction(entry_id) for entry_id in entry_ids]
+
+    # Then
+    assert fractions == [phase_fraction(entry_id) for entry_id in entry_ids]
+    assert all(0 <= fraction < 1 for fraction in fractions)
+    assert len({int(fraction * 10) for fraction in fractions}) == 10
+
+
+def test_refresh_group__should_back_off_exponentially_up_to_the_cap():
+    # Given
+    group = RefreshGroup("totals", timedelta(minutes=15), AsyncMock(), retry_interval=timedelta(minutes=2))
+    group.record_success(START, "a")
+
+    # When
+    delays = []
+    for _ in range(7):
+        group.record_failure(START, RuntimeError("boom"))
+        due = group.next_due()
+        assert due is not None
+        delays.append(due - START)
+
+    # Then
+    assert delays == [timedelta(minutes=minutes) for minutes in (2, 4, 8, 16, 32, 60, 60)]
+
+
+def test_refresh_group__should_snap_back_to_its_interval_after_a_success():
+    # Given
+    group = RefreshGroup("totals", timedelta(minutes=15), AsyncMock(), retry_interval=timedelta(minutes=2))
+    for _ in range(4):
+        group.record_failure(START, RuntimeError("boom"))
+
+    # When
+    group.record_success(START, "a")
+
+    # Then
+    assert group.next_due() == START + timedelta(minutes=15)
+    assert group.metrics["backoff_seconds"] is None
@@ -1,10 +1,17 @@
 """Unit tests for sensor module."""
 
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from custom_components.mylight_systems.api.models import Measure
 from custom_components.mylight_systems.coordinator import MyLightSystemsCoordinatorData
-from custom_components.mylight_systems.sensor import MYLIGHT_SENSORS, _calculate_grid_returned_energy
+from custom_components.mylight_systems.sensor import (
+    MYLIGHT_SENSORS,
+    MyLightSystemsSensor,
+    _calculate_grid_returned_energy,
+)
 
 
 @pytest.fixture
@@ -183,3 +190,67 @@ def test_water_heater_energy__should_return_wh_value_when_measure_is_present(non
 
     # Then — 3600 Ws / 3600 = 1.0 Wh
     assert pytest.approx(1.0) == result
+
+
+def _make_sensor(coordinator, key: str = "total_solar_production"):
+    """Create a sensor entity whose state writes are recorded."""
+    sensor = MyLightSystemsSensor(
+        entry_id="entry-1",
+        coordinator=coordinator,
+        entity_description=next(s for s in MYLIGHT_SENSORS if s.key == key),
+    )
+    return sensor
+
+
+@pytest.fixture
+def mock_write_ha_state():
+    with patch.object(MyLightSystemsSensor, "async_write_ha_state") as write_ha_state:
+        yield write_ha_state
+
+
+def test_handle_coordinator_update__should_skip_write_when_fields_are_unchanged(mock_write_ha_state):
+    # Given
+    coordinator = MagicMock()
+    coordinator.last_update_success = True
+    coordinator.data_changed.return_value = False
+    sensor = _make_sensor(coordinator)
+    sensor._handle_coordinator_update()
+
+    # When
+    sensor._handle_coordinator_update()
+
+    # Then
+    mock_write_ha_state.assert_called_once()
+    coordinator.record_skipped_write.assert_called_once()
+    coordinator.data_changed.assert_called_with(frozenset({"produced_energy"}))
+
+
+def test_handle_coordinator_update__should_write_when_availability_changes(mock_write_ha_state):
+    # Given
+    coordinator = MagicMock()
+    coordinator.last_update_success = True
+    coordinator.data_changed.return_value = False
+    sensor = _make_sensor(coordinator)
+    sensor._handle_coordinator_update()
+
+    # When
+    coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+
+    # Then
+    assert mock_write_ha_state.call_count == 2
+    coordinator.record_skipped_write.assert_not_called()
+
+
+def test_extra_state_attributes__should_show_when_value_is_stale():
+    # Given
+    coordinator = MagicMock()
+    coordinator.stale_since.return_value = datetime(2025, 6, 1, 12, 0, tzinfo=UTC)
+    sensor = _make_sensor(coordinator, "total_autonomy_rate")
+
+    # When
+    attributes = sensor.extra_state_attributes
+
+    # Then
+    assert attributes == {"stale_since": "2025-06-01T12:00:00+00:00"}
+    coordinator.stale_since.assert_called_once_with(frozenset({"autonomy_rate"}))
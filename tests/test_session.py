@@ -0,0 +1,85 @@
+"""Unit tests for the shared connection pools."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mylight_systems.session import (
+    async_acquire_session,
+    async_borrow_session,
+    async_get_rate_limiter,
+    async_get_session,
+    async_release_session,
+)
+
+BASE_URL = "https://myhome.mylight-systems.com"
+
+
+@pytest.fixture
+def hass():
+    """Create a minimal hass mock holding integration data."""
+    hass = MagicMock()
+    hass.data = {}
+    return hass
+
+
+@pytest.mark.asyncio
+async def test_get_session__should_share_one_pool_per_base_url(hass):
+    """Test that config flow, coordinator and diagnostics get the same pool."""
+    session = async_get_session(hass, BASE_URL)
+
+    assert session is async_get_session(hass, BASE_URL)
+    assert session is not async_get_session(hass, "https://other.example.com")
+    hass.bus.async_listen_once.assert_called_once()
+
+    await session.close()
+    await async_get_session(hass, "https://other.example.com").close()
+
+
+@pytest.mark.asyncio
+async def test_release_session__should_close_pool_when_last_entry_unloads(hass):
+    """Test that the pool stays open until every config entry released it."""
+    session = async_acquire_session(hass, BASE_URL)
+    async_acquire_session(hass, BASE_URL)
+
+    await async_release_session(hass, BASE_URL)
+    assert not session.closed
+
+    await async_release_session(hass, BASE_URL)
+    assert session.closed
+    assert async_get_session(hass, BASE_URL) is not session
+
+    await async_get_session(hass, BASE_URL).close()
+
+
+@pytest.mark.asyncio
+async def test_borrow_session__should_close_pool_unless_an_entry_holds_it(hass):
+    """Test that a pool borrowed by the config flow does not outlive it, but one held by an entry does."""
+    async with async_borrow_session(hass, "https://mistyped.example.com") as borrowed:
+        assert not borrowed.closed
+    assert borrowed.closed
+
+    held = async_acquire_session(hass, BASE_URL)
+    async with async_borrow_session(hass, BASE_URL) as session:
+        assert session is held
+    assert not held.closed
+
+    await async_release_session(hass, BASE_URL)
+
+
+@pytest.mark.asyncio
+async def test_get_rate_limiter__should_share_one_limiter_per_pool_and_drop_it_with_the_pool(hass):
+    """Test that entries of a base URL share a limiter that does not outlive their pool."""
+    async_acquire_session(hass, BASE_URL)
+    limiter = async_get_rate_limiter(hass, BASE_URL)
+
+    assert limiter is async_get_rate_limiter(hass, BASE_URL)
+    assert limiter is not async_get_rate_limiter(hass, "https://other.example.com")
+
+    await async_release_session(hass, BASE_URL)
+    assert async_get_rate_limiter(hass, BASE_URL) is not limiter
+
+    await async_get_session(hass, BASE_URL).close()
+    await async_get_session(hass, "https://other.example.com").close()